@@ -2,20 +2,71 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import time
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from openai import AsyncOpenAI
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.text import Text
 
+from open_orchestrator import display
 from open_orchestrator.config import Config
 from open_orchestrator.tools import ToolCall, ToolRegistry
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
 if TYPE_CHECKING:
     from open_orchestrator.permissions import PermissionManager
 
 # Message type aliases
 Message = dict[str, Any]
 
+# Prompt-cache breakpoint marker (Anthropic-style prompt caching)
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Replacement for tool results collapsed by history pruning
+PRUNED_PLACEHOLDER = "[pruned]"
+
+# Once over budget, prune down to this fraction of it so the history prefix
+# (and its prompt cache) stays stable for several turns instead of one
+PRUNE_LOW_WATER = 0.75
+
+
+@dataclass(frozen=True, slots=True)
+class _LLMSettings:
+    """Plain snapshot of the LLM settings used to build each request."""
+    model: str
+    max_tokens: int
+    temperature: float
+    tool_choice: str | None
+    prompt_cache: bool
+
+
+def _truncate_for_history(result: str, limit: int) -> str:
+    """Keep the head and tail of an oversized tool result, eliding the middle."""
+    if limit <= 0 or len(result) <= limit:
+        return result
+    half = limit // 2
+    elided = len(result) - 2 * half
+    return f"{result[:half]}\n...[{elided} chars elided]...\n{result[len(result) - half:]}"
+
+
+def _estimate_tokens(msg: Message) -> int:
+    """Cheap token estimate for a message (~4 characters per token)."""
+    chars = len(msg.get("content") or "")
+    for tc in msg.get("tool_calls") or ():
+        chars += len(tc["function"]["arguments"])
+    return chars // 4 + 4
+
 
 class Agent:
     """A single agent instance that runs the LLM + tool loop."""
@@ -28,6 +79,7 @@ class Agent:
         system_prompt: str | None = None,
         allowed_tools: list[str] | None = None,
         is_subagent: bool = False,
+        client: AsyncOpenAI | None = None,
     ) -> None:
         self.config = config
         self.registry = registry
@@ -36,102 +88,143 @@ class Agent:
         self.system_prompt += f"\n\nWorking directory: {config.working_dir}"
         self.allowed_tools = allowed_tools  # None = all tools
         self.is_subagent = is_subagent
-        self.messages: list[Message] = []
+        self._tools_schema_cache: list[dict[str, Any]] | None = None
+        self.reload_config()
+        # Append-only list of exactly what is sent: system prompt at [0], then history
+        self._wire_messages: list[Message] = [{"role": "system", "content": self.system_prompt}]
 
-        self._client = AsyncOpenAI(
+        # Reuse a shared client when given so agents share one connection pool
+        self._client = client or AsyncOpenAI(
             base_url=config.llm.base_url,
             api_key=config.llm.api_key,
         )
 
+    def reload_config(self) -> None:
+        """Re-read the LLM settings and iteration limit from self.config."""
+        llm = self.config.llm
+        self._llm = _LLMSettings(
+            model=llm.model,
+            max_tokens=llm.max_tokens,
+            temperature=llm.temperature,
+            tool_choice=llm.tool_choice,
+            prompt_cache=llm.prompt_cache,
+        )
+        self._max_iterations = self.config.agent.max_iterations
+
+    @property
+    def messages(self) -> list[Message]:
+        """Conversation history, excluding the system prompt."""
+        return self._wire_messages[1:]
+
     def reset(self) -> None:
         """Clear conversation history."""
-        self.messages = []
+        del self._wire_messages[1:]
+        self._tools_schema_cache = None
 
     def _build_tools_schema(self) -> list[dict[str, Any]]:
-        """Build the tools schema for the LLM call."""
-        return self.registry.to_openai_schema(allowed=self.allowed_tools)
+        """Build the tools schema for the LLM call (cached until reset)."""
+        if self._tools_schema_cache is None:
+            self._tools_schema_cache = self.registry.to_openai_schema(allowed=self.allowed_tools)
+        return self._tools_schema_cache
+
+    @staticmethod
+    def _apply_cache_control(msgs: list[Message]) -> list[Message]:
+        """
+        Return a copy of msgs with cache_control breakpoints on the system
+        message and the second-to-last message, so the server can reuse the
+        cached history prefix. The stored history itself is left untouched.
+        """
+        msgs = list(msgs)
+        targets = {0}
+        if len(msgs) >= 3:
+            targets.add(len(msgs) - 2)
+        for i in targets:
+            content = msgs[i].get("content")
+            if not isinstance(content, str) or not content:
+                continue
+            msgs[i] = {
+                **msgs[i],
+                "content": [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}],
+            }
+        return msgs
 
     async def run(self, user_message: str) -> str:
         """
         Run the agent with a user message.
         Returns the final text response.
         """
-        from open_orchestrator import display
-
-        self.messages.append({"role": "user", "content": user_message})
-
-        for iteration in range(self.config.agent.max_iterations):
-            tools_schema = self._build_tools_schema()
-
-            # Build the API call parameters
-            call_params: dict[str, Any] = {
-                "model": self.config.llm.model,
-                "messages": [
-                    {"role": "system", "content": self.system_prompt},
-                    *self.messages,
-                ],
-                "max_tokens": self.config.llm.max_tokens,
-                "temperature": self.config.llm.temperature,
-            }
-            if tools_schema:
-                call_params["tools"] = tools_schema
-                if self.config.llm.tool_choice is not None:
-                    call_params["tool_choice"] = self.config.llm.tool_choice
+        return await self._run(user_message, live_display=False)
 
+    async def run_streaming(self, user_message: str) -> str:
+        """
+        Run with the response text rendered live as tokens arrive.
+        Returns the final text response.
+        """
+        return await self._run(user_message, live_display=not self.is_subagent)
+
+    async def _run(self, user_message: str, live_display: bool) -> str:
+        """Shared LLM + tool loop for run() and run_streaming()."""
+        self._wire_messages.append({"role": "user", "content": user_message})
+
+        tools_schema = self._build_tools_schema()
+
+        # Build the API call parameters once; "messages" references the live
+        # history list, so appends below are visible on the next iteration
+        llm = self._llm
+        base_params: dict[str, Any] = {
+            "model": llm.model,
+            "messages": self._wire_messages,
+            "max_tokens": llm.max_tokens,
+            "temperature": llm.temperature,
+        }
+        if tools_schema:
+            base_params["tools"] = tools_schema
+            if llm.tool_choice is not None:
+                base_params["tool_choice"] = llm.tool_choice
+
+        # Without tools the model cannot call any, so one completion is enough
+        if not tools_schema:
+            return await self._single_shot(base_params, live_display)
+
+        max_result_chars = self.config.agent.max_tool_result_chars
+
+        for iteration in range(self._max_iterations):
             try:
-                # Stream for final text responses; non-stream for tool calls
-                # We use non-streaming first to detect finish_reason efficiently
-                response = await self._client.chat.completions.create(
-                    stream=False,
-                    **call_params,
+                assistant_msg, finish_reason = await self._request(
+                    self._call_params(base_params), live_display
                 )
             except Exception as e:
-                error_msg = f"LLM API error: {e}"
-                display.print_error(error_msg)
-                return error_msg
-
-            choice = response.choices[0]
-            finish_reason = choice.finish_reason
-            message = choice.message
+                return self._api_error(e)
 
             # Append assistant message to history
-            assistant_msg: Message = {"role": "assistant"}
-            if message.content:
-                assistant_msg["content"] = message.content
-            if message.tool_calls:
-                assistant_msg["tool_calls"] = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        },
-                    }
-                    for tc in message.tool_calls
-                ]
-            self.messages.append(assistant_msg)
+            self._wire_messages.append(assistant_msg)
+            content = assistant_msg.get("content")
+            tool_calls = assistant_msg.get("tool_calls")
 
             # If we have a final text response, display and return it
-            if finish_reason == "stop" or not message.tool_calls:
-                final_text = message.content or ""
-                if final_text and not self.is_subagent:
+            if finish_reason == "stop" or not tool_calls:
+                final_text = content or ""
+                if final_text and not self.is_subagent and not live_display:
                     display.print_assistant_text(final_text)
                 return final_text
 
             # Process tool calls
-            if message.content and not self.is_subagent:
-                display.print_info(message.content)
+            if content and not self.is_subagent and not live_display:
+                display.print_info(content)
 
-            tool_results = await self._execute_tool_calls(message.tool_calls)
+            tool_results = await self._execute_tool_calls(tool_calls)
 
-            # Add tool results to messages
-            for tool_call_id, result in tool_results:
-                self.messages.append({
+            # Add tool results to messages, in the same order as tool_calls
+            self._wire_messages.extend(
+                {
                     "role": "tool",
                     "tool_call_id": tool_call_id,
-                    "content": result,
-                })
+                    "content": _truncate_for_history(result, max_result_chars),
+                }
+                for tool_call_id, result in tool_results
+            )
+
+            self._prune()
 
             # Check if user requested quit
             if self.permissions.quit_requested:
@@ -139,23 +232,190 @@ class Agent:
 
         return "Error: Maximum iterations reached without completing the task."
 
+    def _call_params(self, base_params: dict[str, Any]) -> dict[str, Any]:
+        """Per-request parameters: base_params, plus cache breakpoints if enabled."""
+        if not self._llm.prompt_cache:
+            return base_params
+        return {**base_params, "messages": self._apply_cache_control(self._wire_messages)}
+
+    @staticmethod
+    def _api_error(e: Exception) -> str:
+        """Report an LLM API failure and return the message as the response."""
+        error_msg = f"LLM API error: {e}"
+        display.print_error(error_msg)
+        return error_msg
+
+    async def _single_shot(self, base_params: dict[str, Any], live_display: bool) -> str:
+        """Run one streamed completion with no tool handling."""
+        try:
+            assistant_msg, _ = await self._request(self._call_params(base_params), live_display)
+        except Exception as e:
+            return self._api_error(e)
+
+        self._wire_messages.append(assistant_msg)
+        final_text = assistant_msg.get("content") or ""
+        if final_text and not self.is_subagent and not live_display:
+            display.print_assistant_text(final_text)
+        return final_text
+
+    async def _request(
+        self,
+        call_params: dict[str, Any],
+        live_display: bool,
+    ) -> tuple[Message, str | None]:
+        """Stream one completion, rendering it live when live_display is set."""
+        if not live_display:
+            return await self._stream_completion(call_params)
+
+        with Live(console=display.console, auto_refresh=False) as live:
+            assistant_msg, finish_reason = await self._stream_completion(call_params, live)
+            # Re-render once in place: Markdown for the final answer,
+            # dim text for commentary preceding tool calls
+            streamed = assistant_msg.get("content")
+            if streamed:
+                if finish_reason == "stop" or "tool_calls" not in assistant_msg:
+                    live.update(Markdown(streamed), refresh=True)
+                else:
+                    live.update(Text(streamed, style="dim"), refresh=True)
+            else:
+                live.transient = True
+        return assistant_msg, finish_reason
+
+    def _prune(self) -> None:
+        """
+        Collapse old tool results and tool call arguments, oldest first, once
+        the estimated history size exceeds agent.history_token_budget, down to
+        PRUNE_LOW_WATER of the budget.
+        The system prompt and the last agent.keep_recent_turns user/assistant
+        messages (and everything after them) are left intact.
+        """
+        budget = self.config.agent.history_token_budget
+        if budget <= 0:
+            return
+
+        msgs = self._wire_messages
+        total = sum(_estimate_tokens(m) for m in msgs)
+        if total <= budget:
+            return
+
+        # Everything from `boundary` onwards belongs to the preserved recent turns
+        boundary = len(msgs)
+        keep = self.config.agent.keep_recent_turns
+        if keep > 0:
+            seen = 0
+            for i in range(len(msgs) - 1, 0, -1):
+                if msgs[i]["role"] in ("user", "assistant"):
+                    seen += 1
+                    if seen == keep:
+                        boundary = i
+                        break
+            else:
+                return  # Not enough history to prune yet
+
+        target = int(budget * PRUNE_LOW_WATER)
+        for i in range(1, boundary):
+            if total <= target:
+                break
+            msg = msgs[i]
+            if msg["role"] == "tool" and msg.get("content") != PRUNED_PLACEHOLDER:
+                pruned = {**msg, "content": PRUNED_PLACEHOLDER}
+            elif msg["role"] == "assistant" and any(
+                tc["function"]["arguments"] != "{}" for tc in msg.get("tool_calls") or ()
+            ):
+                pruned = {
+                    **msg,
+                    "tool_calls": [
+                        {**tc, "function": {**tc["function"], "arguments": "{}"}}
+                        for tc in msg["tool_calls"]
+                    ],
+                }
+            else:
+                continue
+            total += _estimate_tokens(pruned) - _estimate_tokens(msg)
+            msgs[i] = pruned
+
+    async def _stream_completion(
+        self,
+        call_params: dict[str, Any],
+        live: Live | None = None,
+    ) -> tuple[Message, str | None]:
+        """
+        Issue a streamed completion and assemble the assistant message.
+        Content deltas are rendered into `live` as they arrive (throttled, so
+        the caller renders the complete text); tool call fragments are merged
+        by their index.
+        Returns (assistant message, finish_reason).
+        """
+        content_buf: list[str] = []
+        tc_buf: dict[int, dict[str, Any]] = {}
+        finish_reason: str | None = None
+        last_refresh = time.monotonic()
+        # A single Text is appended to and re-rendered, never rebuilt per chunk
+        live_text = Text()
+        if live is not None:
+            live.update(live_text)
+
+        stream = await self._client.chat.completions.create(stream=True, **call_params)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+
+            if delta.content:
+                content_buf.append(delta.content)
+                if live is not None:
+                    live_text.append(delta.content)
+                    now = time.monotonic()
+                    if now - last_refresh >= display.STREAM_REFRESH_INTERVAL:
+                        live.refresh()
+                        last_refresh = now
+
+            for tc in delta.tool_calls or ():
+                entry = tc_buf.setdefault(tc.index, {"id": "", "name": "", "arguments": []})
+                if tc.id:
+                    entry["id"] = tc.id
+                if tc.function is not None:
+                    if tc.function.name:
+                        entry["name"] = tc.function.name
+                    if tc.function.arguments:
+                        entry["arguments"].append(tc.function.arguments)
+
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+        assistant_msg: Message = {"role": "assistant"}
+        if content_buf:
+            assistant_msg["content"] = "".join(content_buf)
+        if tc_buf:
+            assistant_msg["tool_calls"] = [
+                {
+                    "id": entry["id"],
+                    "type": "function",
+                    "function": {
+                        "name": entry["name"],
+                        "arguments": "".join(entry["arguments"]),
+                    },
+                }
+                for _, entry in sorted(tc_buf.items())
+            ]
+        return assistant_msg, finish_reason
+
     async def _execute_tool_calls(
         self,
-        tool_calls: list[Any],
+        tool_calls: list[Message],
     ) -> list[tuple[str, str]]:
         """Execute tool calls and return (id, result) pairs."""
-        from open_orchestrator import display
-        import asyncio
-
-        async def execute_one(tc: Any) -> tuple[str, str]:
+        async def execute_one(tc: Message) -> tuple[str, str]:
+            function = tc["function"]
             try:
-                arguments = json.loads(tc.function.arguments)
+                arguments = _json_loads(function["arguments"])
             except json.JSONDecodeError:
                 arguments = {}
 
             call = ToolCall(
-                id=tc.id,
-                name=tc.function.name,
+                id=tc["id"],
+                name=function["name"],
                 arguments=arguments,
             )
 
@@ -181,89 +441,25 @@ class Agent:
 
         # Execute all tool calls (potentially in parallel)
         if len(tool_calls) == 1:
-            return [await execute_one(tool_calls[0])]
-        else:
-            return list(await asyncio.gather(*[execute_one(tc) for tc in tool_calls]))
+            result = await execute_one(tool_calls[0])
+            return [result]
 
-    async def run_streaming(self, user_message: str) -> str:
-        """
-        Run with streaming for the final text response.
-        Uses non-streaming for tool-call iterations.
-        """
-        from open_orchestrator import display
-        from rich.live import Live
-        from rich.text import Text
-
-        self.messages.append({"role": "user", "content": user_message})
-
-        for iteration in range(self.config.agent.max_iterations):
-            tools_schema = self._build_tools_schema()
-
-            call_params: dict[str, Any] = {
-                "model": self.config.llm.model,
-                "messages": [
-                    {"role": "system", "content": self.system_prompt},
-                    *self.messages,
-                ],
-                "max_tokens": self.config.llm.max_tokens,
-                "temperature": self.config.llm.temperature,
-            }
-            if tools_schema:
-                call_params["tools"] = tools_schema
-                if self.config.llm.tool_choice is not None:
-                    call_params["tool_choice"] = self.config.llm.tool_choice
+        # Results are stored by position so they keep the order of tool_calls
+        results: list[tuple[str, str]] = [None] * len(tool_calls)  # type: ignore[list-item]
+
+        # The first failure is re-raised as is once every call has finished,
+        # rather than cancelling the others and surfacing an ExceptionGroup
+        errors: list[Exception] = []
 
-            # First do a non-streaming call to determine finish_reason
+        async def run_at(i: int, tc: Message) -> None:
             try:
-                response = await self._client.chat.completions.create(
-                    stream=False,
-                    **call_params,
-                )
+                results[i] = await execute_one(tc)
             except Exception as e:
-                error_msg = f"LLM API error: {e}"
-                display.print_error(error_msg)
-                return error_msg
-
-            choice = response.choices[0]
-            finish_reason = choice.finish_reason
-            message = choice.message
-
-            assistant_msg: Message = {"role": "assistant"}
-            if message.content:
-                assistant_msg["content"] = message.content
-            if message.tool_calls:
-                assistant_msg["tool_calls"] = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        },
-                    }
-                    for tc in message.tool_calls
-                ]
-            self.messages.append(assistant_msg)
-
-            if finish_reason == "stop" or not message.tool_calls:
-                final_text = message.content or ""
-                if final_text and not self.is_subagent:
-                    display.print_assistant_text(final_text)
-                return final_text
-
-            if message.content and not self.is_subagent:
-                display.print_info(message.content)
-
-            tool_results = await self._execute_tool_calls(message.tool_calls)
-
-            for tool_call_id, result in tool_results:
-                self.messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call_id,
-                    "content": result,
-                })
-
-            if self.permissions.quit_requested:
-                return "Session terminated by user."
-
-        return "Error: Maximum iterations reached without completing the task."
+                errors.append(e)
+
+        async with asyncio.TaskGroup() as tg:
+            for i, tc in enumerate(tool_calls):
+                tg.create_task(run_at(i, tc))
+        if errors:
+            raise errors[0]
+        return results
@@ -9,6 +9,14 @@ from typing import Literal
 import yaml
 from pydantic import BaseModel, Field
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+# Parsed YAML keyed by (path, mtime_ns) so repeated loads skip parsing
+_RAW_CACHE: dict[tuple[str, int], dict] = {}
+
 
 class LLMConfig(BaseModel):
     base_url: str = "http://localhost:8000/v1"
@@ -17,6 +25,7 @@ class LLMConfig(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.0
     tool_choice: str | None = None  # e.g. "auto" requires vLLM --enable-auto-tool-choice
+    prompt_cache: bool = False  # Tag the history prefix with cache_control breakpoints
 
 
 class PermissionsConfig(BaseModel):
@@ -26,6 +35,10 @@ class PermissionsConfig(BaseModel):
 
 class AgentConfig(BaseModel):
     max_iterations: int = 50
+    max_parallel_subagents: int = Field(default=8, ge=1)  # Concurrent sub-agents in run_parallel
+    history_token_budget: int = 32000  # Estimated history tokens before pruning (0 = never prune)
+    keep_recent_turns: int = 6  # Recent user/assistant messages never pruned
+    max_tool_result_chars: int = 8000  # Head+tail kept for each stored tool result (0 = no limit)
     system_prompt: str = (
         "You are a helpful AI assistant with access to tools for reading/writing files, "
         "executing shell commands, and searching codebases. Work step by step and explain "
@@ -40,6 +53,17 @@ class Config(BaseModel):
     working_dir: Path = Field(default_factory=Path.cwd)
 
 
+def _read_yaml(path: Path) -> dict:
+    """Parse a YAML file, reusing the cached result while it is unmodified."""
+    key = (str(path.resolve()), path.stat().st_mtime_ns)
+    raw = _RAW_CACHE.get(key)
+    if raw is None:
+        with open(path) as f:
+            raw = yaml.load(f, Loader=_YamlLoader) or {}
+        _RAW_CACHE[key] = raw
+    return raw
+
+
 def load_config(config_path: Path | None = None) -> Config:
     """Load configuration from YAML file with environment variable overrides."""
     # Default search paths
@@ -52,8 +76,7 @@ def load_config(config_path: Path | None = None) -> Config:
     raw: dict = {}
     for path in search_paths:
         if path and path.exists():
-            with open(path) as f:
-                raw = yaml.safe_load(f) or {}
+            raw = _read_yaml(path)
             break
 
     config = Config.model_validate(raw)
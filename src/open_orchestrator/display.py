@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import functools
 import json
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from rich.console import Console
 from rich.live import Live
@@ -13,8 +15,39 @@ from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.text import Text
 
+try:
+    import orjson
+
+    def _dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    def _dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
 console = Console()
 
+# Minimum seconds between live display refreshes while streaming (~20Hz)
+STREAM_REFRESH_INTERVAL = 0.05
+
+# Arguments shorter than this are shown as plain text (no syntax highlighting)
+HIGHLIGHT_MIN_CHARS = 200
+
+
+@functools.lru_cache(maxsize=1)
+def _json_lexer() -> Any:
+    """Look up the pygments JSON lexer once."""
+    from pygments.lexers import get_lexer_by_name
+
+    return get_lexer_by_name("json")
+
+
+def _render_arguments(arguments: dict[str, Any]) -> Text | Syntax:
+    """Render tool arguments, highlighting only when it is worth it."""
+    args_str = _dumps_pretty(arguments)
+    if len(args_str) < HIGHLIGHT_MIN_CHARS or not console.is_terminal:
+        return Text(args_str)
+    return Syntax(args_str, _json_lexer(), theme="monokai", word_wrap=True)
+
 
 def print_welcome(working_dir: Path | None = None) -> None:
     """Print welcome banner."""
@@ -60,24 +93,28 @@ def print_assistant_text(text: str) -> None:
         console.print(Markdown(text))
 
 
-def stream_text(chunks: list[str]) -> None:
+def stream_text(chunks: Iterable[str]) -> None:
     """Display streamed text chunks."""
-    with Live(console=console, refresh_per_second=20) as live:
-        accumulated = ""
+    # Append each chunk to one Text instead of re-building it from the whole string
+    buf = Text()
+    with Live(buf, console=console, auto_refresh=False) as live:
+        last_refresh = time.monotonic()
         for chunk in chunks:
-            accumulated += chunk
-            live.update(Text(accumulated))
+            buf.append(chunk)
+            now = time.monotonic()
+            if now - last_refresh >= STREAM_REFRESH_INTERVAL:
+                live.refresh()
+                last_refresh = now
+        live.refresh()
     # Final newline
     console.print()
 
 
 def print_tool_call(tool_name: str, arguments: dict[str, Any]) -> None:
     """Display tool call being made."""
-    args_str = json.dumps(arguments, ensure_ascii=False, indent=2)
-    syntax = Syntax(args_str, "json", theme="monokai", word_wrap=True)
     console.print(
         Panel(
-            syntax,
+            _render_arguments(arguments),
             title=f"[bold yellow]Tool: {tool_name}[/bold yellow]",
             border_style="yellow",
         )
@@ -102,11 +139,9 @@ def print_tool_result(tool_name: str, result: str, success: bool = True) -> None
 
 def print_permission_request(tool_name: str, arguments: dict[str, Any]) -> None:
     """Display permission request panel."""
-    args_str = json.dumps(arguments, ensure_ascii=False, indent=2)
-    syntax = Syntax(args_str, "json", theme="monokai", word_wrap=True)
     console.print(
         Panel(
-            syntax,
+            _render_arguments(arguments),
             title=f"[bold red]Permission Required: {tool_name}[/bold red]",
             subtitle="[y] Allow  [n] Deny  [a] Always allow  [q] Quit session",
             border_style="red",
@@ -6,13 +6,15 @@ import argparse
 import asyncio
 import sys
 from pathlib import Path
-from typing import Literal
+from typing import Callable, Literal
 
+from openai import AsyncOpenAI
 from prompt_toolkit import PromptSession
 from prompt_toolkit.history import FileHistory
 from prompt_toolkit.key_binding import KeyBindings
 from rich.console import Console
 
+from open_orchestrator import display
 from open_orchestrator.config import Config, load_config
 from open_orchestrator.orchestrator import Orchestrator
 from open_orchestrator.permissions import PermissionManager
@@ -20,11 +22,16 @@ from open_orchestrator.tools import get_registry
 from open_orchestrator.tools.bash_tool import register_bash_tool
 from open_orchestrator.tools.file_tools import register_file_tools
 from open_orchestrator.tools.search_tools import register_search_tools
+from open_orchestrator.tools.task_tool import register_task_tool
 
 console = Console()
 
 
-def setup_tools(config: Config, permissions: PermissionManager) -> None:
+def setup_tools(
+    config: Config,
+    permissions: PermissionManager,
+    client: AsyncOpenAI | None = None,
+) -> None:
     """Register all tools into the global registry."""
     working_dir = config.working_dir
     register_file_tools(working_dir)
@@ -33,8 +40,8 @@ def setup_tools(config: Config, permissions: PermissionManager) -> None:
 
     # Task tool is registered last as it depends on other components
     registry = get_registry()
-    from open_orchestrator.tools.task_tool import register_task_tool
-    register_task_tool(config, registry, permissions)
+    register_task_tool(config, registry, permissions, client)
+    registry.freeze()
 
 
 def parse_args() -> argparse.Namespace:
@@ -74,6 +81,78 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _cmd_exit(
+    args: list[str],
+    agent: "Agent",  # noqa: F821
+    permissions: PermissionManager,
+    config: Config,
+) -> bool:
+    console.print("[dim]Goodbye.[/dim]")
+    return False
+
+
+def _cmd_help(
+    args: list[str],
+    agent: "Agent",  # noqa: F821
+    permissions: PermissionManager,
+    config: Config,
+) -> bool:
+    display.print_help()
+    return True
+
+
+def _cmd_clear(
+    args: list[str],
+    agent: "Agent",  # noqa: F821
+    permissions: PermissionManager,
+    config: Config,
+) -> bool:
+    agent.reset()
+    console.print("[dim]Conversation history cleared.[/dim]")
+    return True
+
+
+def _cmd_tools(
+    args: list[str],
+    agent: "Agent",  # noqa: F821
+    permissions: PermissionManager,
+    config: Config,
+) -> bool:
+    registry = get_registry()
+    display.print_tools_list(registry.to_openai_schema())
+    return True
+
+
+def _cmd_mode(
+    args: list[str],
+    agent: "Agent",  # noqa: F821
+    permissions: PermissionManager,
+    config: Config,
+) -> bool:
+    if args and args[0] in ("auto", "ask", "deny"):
+        mode = args[0]
+        permissions.set_mode(mode)  # type: ignore
+        console.print(f"[dim]Permission mode set to: {mode}[/dim]")
+    else:
+        console.print(
+            f"[dim]Current mode: {permissions.default_mode}. "
+            "Usage: /mode [auto|ask|deny][/dim]"
+        )
+    return True
+
+
+SlashCommand = Callable[[list[str], "Agent", PermissionManager, Config], bool]  # noqa: F821
+
+_CMDS: dict[str, SlashCommand] = {
+    "/help": _cmd_help,
+    "/clear": _cmd_clear,
+    "/tools": _cmd_tools,
+    "/mode": _cmd_mode,
+    "/exit": _cmd_exit,
+    "/quit": _cmd_exit,
+}
+
+
 def handle_slash_command(
     cmd: str,
     agent: "Agent",  # noqa: F821
@@ -84,48 +163,16 @@ def handle_slash_command(
     Handle a slash command.
     Returns True if the REPL should continue, False to exit.
     """
-    from open_orchestrator import display
-
-    parts = cmd.strip().split()
-    command = parts[0].lower()
-    args = parts[1:] if len(parts) > 1 else []
-
-    if command in ("/exit", "/quit"):
-        console.print("[dim]Goodbye.[/dim]")
-        return False
-
-    elif command == "/help":
-        display.print_help()
-
-    elif command == "/clear":
-        agent.reset()
-        console.print("[dim]Conversation history cleared.[/dim]")
-
-    elif command == "/tools":
-        registry = get_registry()
-        display.print_tools_list(registry.to_openai_schema())
-
-    elif command == "/mode":
-        if args and args[0] in ("auto", "ask", "deny"):
-            mode = args[0]
-            permissions.set_mode(mode)  # type: ignore
-            console.print(f"[dim]Permission mode set to: {mode}[/dim]")
-        else:
-            console.print(
-                f"[dim]Current mode: {permissions.default_mode}. "
-                "Usage: /mode [auto|ask|deny][/dim]"
-            )
-
-    else:
+    command, *args = cmd.split() or [""]
+    handler = _CMDS.get(command.lower())
+    if handler is None:
         console.print(f"[red]Unknown command: {command}. Type /help for help.[/red]")
-
-    return True
+        return True
+    return handler(args, agent, permissions, config)
 
 
 async def run_repl(agent: "Agent", permissions: PermissionManager, config: Config) -> None:  # noqa: F821
     """Run the interactive REPL loop."""
-    from open_orchestrator import display
-
     display.print_welcome(config.working_dir)
 
     history_file = Path.home() / ".local" / "share" / "open-orchestrator" / "history"
@@ -173,8 +220,6 @@ async def run_repl(agent: "Agent", permissions: PermissionManager, config: Confi
 
 async def run_oneshot(agent: "Agent", prompt: str) -> None:  # noqa: F821
     """Run a single prompt and exit."""
-    from open_orchestrator import display
-
     try:
         await agent.run_streaming(prompt)
     except KeyboardInterrupt:
@@ -209,19 +254,27 @@ def main() -> None:
     if args.mode:
         config.permissions.default_mode = args.mode  # type: ignore
 
-    # Register all tools
-    setup_tools(config, permissions)
-
-    # Create orchestrator and main agent
+    # Create orchestrator (owns the shared LLM client)
     registry = get_registry()
     orchestrator = Orchestrator(config, registry, permissions)
+
+    # Register all tools
+    setup_tools(config, permissions, orchestrator.client)
+
+    # Create main agent
     agent = orchestrator.create_main_agent()
 
+    async def run() -> None:
+        try:
+            if args.prompt:
+                await run_oneshot(agent, args.prompt)
+            else:
+                await run_repl(agent, permissions, config)
+        finally:
+            await orchestrator.aclose()
+
     # Run
-    if args.prompt:
-        asyncio.run(run_oneshot(agent, args.prompt))
-    else:
-        asyncio.run(run_repl(agent, permissions, config))
+    asyncio.run(run())
 
 
 if __name__ == "__main__":
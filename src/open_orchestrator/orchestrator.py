@@ -5,6 +5,8 @@ from __future__ import annotations
 import asyncio
 from typing import Any
 
+from openai import AsyncOpenAI
+
 from open_orchestrator.config import Config
 from open_orchestrator.permissions import PermissionManager
 from open_orchestrator.tools import ToolRegistry
@@ -14,6 +16,7 @@ class Orchestrator:
     """
     Manages the creation and coordination of agents.
     Handles parallel sub-agent execution via asyncio.gather().
+    All agents share one AsyncOpenAI client (and its connection pool).
     """
 
     def __init__(
@@ -25,6 +28,10 @@ class Orchestrator:
         self.config = config
         self.registry = registry
         self.permissions = permissions
+        self.client = AsyncOpenAI(
+            base_url=config.llm.base_url,
+            api_key=config.llm.api_key,
+        )
 
     def create_main_agent(self) -> "Agent":  # noqa: F821
         """Create the primary agent with all tools."""
@@ -34,6 +41,7 @@ class Orchestrator:
             config=self.config,
             registry=self.registry,
             permissions=self.permissions,
+            client=self.client,
         )
 
     def create_subagent(
@@ -55,9 +63,22 @@ class Orchestrator:
             system_prompt=system_prompt or SUBAGENT_SYSTEM_PROMPT,
             allowed_tools=allowed_tools or DEFAULT_SUBAGENT_TOOLS,
             is_subagent=True,
+            client=self.client,
         )
 
     async def run_parallel(self, prompts: list[str]) -> list[str]:
-        """Run multiple sub-agents in parallel and collect results."""
-        tasks = [self.create_subagent().run(prompt) for prompt in prompts]
-        return list(await asyncio.gather(*tasks))
+        """
+        Run multiple sub-agents in parallel and collect results.
+        At most agent.max_parallel_subagents run at the same time.
+        """
+        sem = asyncio.Semaphore(self.config.agent.max_parallel_subagents)
+
+        async def run_one(prompt: str) -> str:
+            async with sem:
+                return await self.create_subagent().run(prompt)
+
+        return list(await asyncio.gather(*[run_one(prompt) for prompt in prompts]))
+
+    async def aclose(self) -> None:
+        """Close the shared LLM client."""
+        await self.client.close()
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import sys
 from typing import Literal
 
+from prompt_toolkit import PromptSession
+
+from open_orchestrator import display
 from open_orchestrator.tools import Tool, ToolCall
 
 PermissionMode = Literal["auto", "ask", "deny"]
 
+# Shared session for permission prompts, created on first use
+_perm_session: PromptSession | None = None
+
 
 class PermissionManager:
     """Manages tool execution permissions."""
@@ -19,9 +26,10 @@ class PermissionManager:
         auto_allow: list[str] | None = None,
     ) -> None:
         self.default_mode = default_mode
-        self._auto_allow: set[str] = set(auto_allow or [])
+        self._auto_allow: frozenset[str] = frozenset(auto_allow or ())
         self._session_allowed: set[str] = set()  # Tools allowed for the whole session
         self._quit_requested = False
+        self._prompt_lock = asyncio.Lock()  # One permission prompt at a time
 
     @property
     def quit_requested(self) -> bool:
@@ -38,9 +46,9 @@ class PermissionManager:
     def is_auto_allowed(self, tool_name: str) -> bool:
         """Check if a tool is automatically allowed."""
         return (
-            tool_name in self._auto_allow
+            self.default_mode == "auto"
+            or tool_name in self._auto_allow
             or tool_name in self._session_allowed
-            or self.default_mode == "auto"
         )
 
     async def check(self, call: ToolCall, tool: Tool | None = None) -> bool:
@@ -48,9 +56,6 @@ class PermissionManager:
         Check if a tool call is permitted.
         Returns True if allowed, False if denied.
         """
-        # Import here to avoid circular imports
-        from open_orchestrator import display
-
         requires_perm = tool.requires_permission if tool else True
 
         # Tools that don't require permission are always allowed
@@ -66,10 +71,16 @@ class PermissionManager:
             display.print_info(f"Tool '{call.name}' denied (mode: deny)")
             return False
 
-        # Ask mode: prompt user
-        return await self._prompt_user(call, display)
+        # Ask mode: prompt user (parallel tool calls wait their turn)
+        async with self._prompt_lock:
+            # The user may have quit or chosen "always allow" while this call waited
+            if self._quit_requested:
+                return False
+            if self.is_auto_allowed(call.name):
+                return True
+            return await self._prompt_user(call)
 
-    async def _prompt_user(self, call: ToolCall, display: object) -> bool:
+    async def _prompt_user(self, call: ToolCall) -> bool:
         """Prompt the user for permission. Returns True if allowed."""
         display.print_permission_request(call.name, call.arguments)
 
@@ -100,9 +111,8 @@ class PermissionManager:
 
 
 async def _async_input(prompt: str) -> str:
-    """Async-compatible input function."""
-    import asyncio
-
-    loop = asyncio.get_event_loop()
-    # Run input() in a thread executor to not block the event loop
-    return await loop.run_in_executor(None, lambda: input(prompt))
+    """Async-compatible input function running on the current event loop."""
+    global _perm_session
+    if _perm_session is None:
+        _perm_session = PromptSession()
+    return (await _perm_session.prompt_async(prompt)).strip()
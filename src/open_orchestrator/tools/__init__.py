@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Callable
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
 
 @dataclass
@@ -15,6 +18,13 @@ class Tool:
     parameters_schema: dict[str, Any]   # JSON Schema for parameters
     handler: Callable[..., Any]          # async or sync handler
     requires_permission: bool = False
+    is_async: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Decided once here rather than on every call; sees through partials and wrappers
+        self.is_async = inspect.iscoroutinefunction(self.handler) or (
+            inspect.iscoroutinefunction(getattr(self.handler, "__wrapped__", None))
+        )
 
 
 @dataclass
@@ -24,16 +34,38 @@ class ToolCall:
     name: str
     arguments: dict[str, Any]
 
+    def __post_init__(self) -> None:
+        # Names off the wire are fresh strings; interned ones match registry keys by identity
+        self.name = sys.intern(self.name)
+
 
 class ToolRegistry:
     """Registry of available tools."""
 
     def __init__(self) -> None:
-        self._tools: dict[str, Tool] = {}
+        self._tools: Mapping[str, Tool] = {}
+        self._frozen = False
+        # OpenAI-format schema per tool, built once at registration
+        self._schema_cache: dict[str, dict[str, Any]] = {}
 
     def register(self, tool: Tool) -> None:
         """Register a tool."""
-        self._tools[tool.name] = tool
+        if self._frozen:
+            raise RuntimeError(f"Cannot register '{tool.name}': the tool registry is frozen")
+        self._tools[sys.intern(tool.name)] = tool  # type: ignore[index]
+        self._schema_cache[tool.name] = {
+            "type": "function",
+            "function": {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.parameters_schema,
+            },
+        }
+
+    def freeze(self) -> None:
+        """Make the registry read-only. Call once all tools are registered."""
+        self._tools = MappingProxyType(dict(self._tools))
+        self._frozen = True
 
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -45,19 +77,10 @@ class ToolRegistry:
 
     def to_openai_schema(self, allowed: list[str] | None = None) -> list[dict[str, Any]]:
         """Convert tools to OpenAI API format."""
-        tools = []
-        for name, tool in self._tools.items():
-            if allowed is not None and name not in allowed:
-                continue
-            tools.append({
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": tool.parameters_schema,
-                },
-            })
-        return tools
+        if allowed is None:
+            return list(self._schema_cache.values())
+        allowed_set = set(allowed)
+        return [schema for name, schema in self._schema_cache.items() if name in allowed_set]
 
     async def execute(self, call: ToolCall) -> str:
         """Execute a tool call and return string result."""
@@ -66,10 +89,14 @@ class ToolRegistry:
             return f"Error: Unknown tool '{call.name}'"
 
         try:
-            if asyncio.iscoroutinefunction(tool.handler):
+            if tool.is_async:
                 result = await tool.handler(**call.arguments)
             else:
-                result = tool.handler(**call.arguments)
+                # Sync handlers do blocking I/O; keep them off the event loop
+                result = await asyncio.to_thread(tool.handler, **call.arguments)
+                if inspect.isawaitable(result):
+                    # e.g. a lambda wrapping an async function
+                    result = await result
             return str(result)
         except TypeError as e:
             return f"Error: Invalid arguments for '{call.name}': {e}"
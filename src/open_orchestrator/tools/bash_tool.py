@@ -3,12 +3,219 @@
 from __future__ import annotations
 
 import asyncio
+import errno
+import os
+import re
+import shlex
+import shutil
+import signal
+import sys
+from functools import partial
 from pathlib import Path
+from typing import BinaryIO, Callable
 
 from open_orchestrator.tools import Tool, register_tool
 
 DEFAULT_TIMEOUT = 30
 
+# Spawn directly with posix_spawn (vfork + exec) where glibc provides it
+_USE_POSIX_SPAWN = sys.platform == "linux" and hasattr(os, "posix_spawn")
+
+# Anything here means the command needs a shell to mean what it says
+_SHELL_META = re.compile(r"""[|&;<>()$`\\"'*?\[\]{}\n\r]""")
+# Words the shell handles itself (or whose binary behaves differently, like echo -e)
+_SHELL_BUILTINS = frozenset({
+    "!", ".", ":", "[", "{", "}", "alias", "bg", "break", "case", "cd", "command",
+    "continue", "do", "done", "echo", "elif", "else", "esac", "eval", "exec", "exit",
+    "export", "false", "fg", "fi", "for", "function", "getopts", "hash", "if", "jobs",
+    "kill", "local", "printf", "pwd", "read", "readonly", "return", "set", "shift",
+    "source", "test", "then", "time", "times", "trap", "true", "type", "ulimit",
+    "umask", "unalias", "unset", "until", "wait", "while",
+})
+
+
+def _simple_argv(command: str) -> list[str] | None:
+    """
+    Split command into argv if running it without a shell gives the same
+    result: no metacharacters, builtins, assignments, comments or tildes.
+    """
+    if _SHELL_META.search(command):
+        return None
+    argv = shlex.split(command)
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    if any(word.startswith(("~", "#")) for word in argv):
+        return None
+    return argv
+
+
+async def _read_pipe(pipe: BinaryIO) -> bytes:
+    """Read a pipe to EOF on the event loop."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), pipe
+    )
+    try:
+        return await reader.read()
+    finally:
+        transport.close()
+
+
+async def _wait_exit(pid: int) -> int:
+    """
+    Wait for a child to exit and reap it, returning its wait status. Watches
+    a pidfd on the loop so no worker thread is held for the command's lifetime.
+    """
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return (await asyncio.to_thread(os.waitpid, pid, 0))[1]
+
+    loop = asyncio.get_running_loop()
+    exited = loop.create_future()
+    loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+    try:
+        await exited
+    finally:
+        loop.remove_reader(pidfd)
+        os.close(pidfd)
+    return os.waitpid(pid, 0)[1]
+
+
+# Waits left running after a timeout or cancellation, so the child is still reaped
+_pending_waits: set[asyncio.Task[int]] = set()
+
+
+async def _run_spawned(command: str, cwd: str, timeout: int) -> tuple[int, bytes, bytes] | None:
+    """Run command under /bin/sh via os.posix_spawn. Returns None on timeout."""
+    # posix_spawn has no chdir action, so the shell changes directory itself
+    if not os.path.isdir(cwd):
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), cwd)
+    script = f"cd -- {shlex.quote(cwd)} || exit\n{command}"
+    return await _spawn_and_collect(os.posix_spawn, "/bin/sh", ["/bin/sh", "-c", script], timeout)
+
+
+async def _spawn_and_collect(
+    spawn: Callable[..., int],
+    path: str,
+    argv: list[str],
+    timeout: int,
+) -> tuple[int, bytes, bytes] | None:
+    """
+    Start a process with spawn (os.posix_spawn or os.posix_spawnp), reading
+    its output with loop pipes. Returns (returncode, stdout, stderr), or None
+    on timeout, in which case the process is killed without waiting for
+    anything still holding its pipes.
+    """
+    r_out, w_out = os.pipe()
+    r_err, w_err = os.pipe()
+    try:
+        pid = await asyncio.to_thread(
+            spawn,
+            path,
+            argv,
+            os.environ,
+            file_actions=[
+                (os.POSIX_SPAWN_DUP2, w_out, 1),
+                (os.POSIX_SPAWN_DUP2, w_err, 2),
+            ],
+        )
+    except BaseException:
+        os.close(r_out)
+        os.close(r_err)
+        raise
+    finally:
+        os.close(w_out)
+        os.close(w_err)
+
+    # Owned here from now on: closed below even if the reads never start
+    out_pipe = os.fdopen(r_out, "rb", 0)
+    err_pipe = os.fdopen(r_err, "rb", 0)
+
+    waiter = asyncio.ensure_future(_wait_exit(pid))
+    _pending_waits.add(waiter)
+    waiter.add_done_callback(_pending_waits.discard)
+
+    async def collect() -> tuple[bytes, bytes, int]:
+        stdout, stderr = await asyncio.gather(_read_pipe(out_pipe), _read_pipe(err_pipe))
+        return stdout, stderr, await asyncio.shield(waiter)
+
+    try:
+        stdout, stderr, status = await asyncio.wait_for(collect(), timeout=timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        if not waiter.done():
+            os.kill(pid, signal.SIGKILL)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        return None
+    finally:
+        out_pipe.close()
+        err_pipe.close()
+    return os.waitstatus_to_exitcode(status), stdout, stderr
+
+
+async def _run_asyncio(command: str, cwd: str, timeout: int) -> tuple[int, bytes, bytes] | None:
+    """Run command with asyncio's subprocess support. Returns None on timeout."""
+    proc = await asyncio.create_subprocess_shell(
+        command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    return await _communicate(proc, timeout)
+
+
+async def _communicate(
+    proc: asyncio.subprocess.Process, timeout: int
+) -> tuple[int, bytes, bytes] | None:
+    """Collect a process's output. Returns None (after killing it) on timeout."""
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.communicate()
+        return None
+    return proc.returncode, stdout, stderr
+
+
+def _exec_argv(command: str, cwd: str) -> list[str] | None:
+    """
+    argv to exec without a shell, or None to go through the shell. Besides
+    needing no shell syntax, the program must resolve on PATH (so a missing
+    one gets the shell's usual "not found"), and on Linux the command must
+    run in this process's cwd, since posix_spawnp can't change directory.
+    """
+    argv = _simple_argv(command)
+    if argv is None or "/" in argv[0] or shutil.which(argv[0]) is None:
+        return None
+    if _USE_POSIX_SPAWN:
+        try:
+            if not os.path.samefile(cwd, os.getcwd()):
+                return None
+        except OSError:
+            return None
+    return argv
+
+
+async def _run_exec(argv: list[str], cwd: str, timeout: int) -> tuple[int, bytes, bytes] | None:
+    """
+    Run argv without a shell. Returns None on timeout. On Linux, cwd must be
+    the process cwd (see _exec_argv).
+    """
+    if _USE_POSIX_SPAWN:
+        return await _spawn_and_collect(os.posix_spawnp, argv[0], argv, timeout)
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    return await _communicate(proc, timeout)
+
 
 async def bash(
     command: str,
@@ -19,22 +226,16 @@ async def bash(
 ) -> str:
     """Execute a shell command and return its output."""
     effective_cwd = cwd if cwd is not None else str(working_dir)
+    run = _run_spawned if _USE_POSIX_SPAWN else _run_asyncio
     try:
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=effective_cwd,
-        )
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(),
-                timeout=timeout,
-            )
-        except asyncio.TimeoutError:
-            proc.kill()
-            await proc.communicate()
+        argv = _exec_argv(command, effective_cwd)
+        if argv is not None:
+            result = await _run_exec(argv, effective_cwd, timeout)
+        else:
+            result = await run(command, effective_cwd, timeout)
+        if result is None:
             return f"Error: Command timed out after {timeout} seconds: {command}"
+        returncode, stdout, stderr = result
 
         output_parts = []
         if stdout:
@@ -46,10 +247,10 @@ async def bash(
 
         output = "\n".join(output_parts) if output_parts else ""
 
-        if proc.returncode != 0:
+        if returncode != 0:
             if output:
-                return f"Exit code {proc.returncode}:\n{output}"
-            return f"Exit code {proc.returncode}"
+                return f"Exit code {returncode}:\n{output}"
+            return f"Exit code {returncode}"
 
         return output if output else "(no output)"
 
@@ -85,6 +286,6 @@ def register_bash_tool(working_dir: Path) -> None:
             },
             "required": ["command"],
         },
-        handler=lambda **kwargs: bash(**kwargs, working_dir=working_dir),
+        handler=partial(bash, working_dir=working_dir),
         requires_permission=True,
     ))
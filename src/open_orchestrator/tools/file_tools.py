@@ -2,9 +2,22 @@
 
 from __future__ import annotations
 
+import mmap
+import os
+from functools import partial
 from pathlib import Path
 
 from open_orchestrator.tools import Tool, register_tool
+from open_orchestrator.tools.file_tools_fast import format_numbered_lines
+
+# Windowed reads of files larger than this go through mmap
+MMAP_MIN_BYTES = 256 * 1024
+COUNT_CHUNK_BYTES = 1024 * 1024
+# Content longer than this is written with raw os.write calls
+DIRECT_WRITE_MIN_CHARS = 64 * 1024
+WRITE_CHUNK_BYTES = 1024 * 1024
+# Below this many lines the compiled formatter's call overhead isn't worth it
+NUMBA_MIN_LINES = 5000
 
 
 def _resolve(path: str, working_dir: Path) -> Path:
@@ -15,6 +28,50 @@ def _resolve(path: str, working_dir: Path) -> Path:
     return working_dir / p
 
 
+def _read_window(file_path: Path, start: int, limit: int) -> tuple[list[str], int] | None:
+    """
+    Return lines [start, start + limit) of a file and its total line count,
+    decoding only the requested range. Returns None for files containing
+    carriage returns, whose line breaks only text mode handles.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        with mmap.mmap(fd, 0, prot=mmap.PROT_READ) as mm:
+            if mm.find(b"\r") != -1:
+                return None
+            size = len(mm)
+            # Count newlines slice by slice (mmap has no count() before 3.13),
+            # noting where line `start` begins on the way
+            total = 0
+            pos = 0 if start == 0 else -1
+            for i in range(0, size, COUNT_CHUNK_BYTES):
+                n = mm[i:i + COUNT_CHUNK_BYTES].count(b"\n")
+                if pos < 0 and total + n >= start:
+                    pos = i
+                    for _ in range(start - total):
+                        pos = mm.find(b"\n", pos) + 1
+                total += n
+            if mm[size - 1] != ord("\n"):
+                total += 1
+            if start >= total:
+                return [], total
+
+            end = pos
+            for _ in range(limit):
+                end = mm.find(b"\n", end) + 1
+                if end == 0 or end >= size:
+                    end = size
+                    break
+            chunk = mm[pos:end].decode("utf-8", errors="replace")
+    finally:
+        os.close(fd)
+
+    lines = chunk.split("\n")
+    if not lines[-1]:
+        lines.pop()
+    return lines, total
+
+
 def read_file(path: str, offset: int = 1, limit: int | None = None, *, working_dir: Path) -> str:
     """Read a file and return its contents with line numbers."""
     file_path = _resolve(path, working_dir)
@@ -23,29 +80,60 @@ def read_file(path: str, offset: int = 1, limit: int | None = None, *, working_d
     if not file_path.is_file():
         return f"Error: Not a file: {path}"
 
+    # Apply offset and limit (1-indexed)
+    start = max(0, offset - 1)
+
     try:
-        lines = file_path.read_text(encoding="utf-8", errors="replace").splitlines()
+        window = None
+        if limit is not None and limit > 0 and file_path.stat().st_size > MMAP_MIN_BYTES:
+            window = _read_window(file_path, start, limit)
+
+        if window is None:
+            text = file_path.read_text(encoding="utf-8", errors="replace")
+            # Text mode already normalized newlines, so a plain split is enough
+            lines = text.split("\n")
+            if not lines[-1]:
+                lines.pop()  # Trailing newline (or empty file)
+            total = len(lines)
+            selected = lines[start:total if limit is None else start + limit]
+        else:
+            selected, total = window
     except Exception as e:
         return f"Error reading file: {e}"
 
-    # Apply offset and limit (1-indexed)
-    start = max(0, offset - 1)
-    end = len(lines) if limit is None else start + limit
-    selected = lines[start:end]
+    end = total if limit is None else start + limit
 
     if not selected:
         return f"(File is empty or offset {offset} is beyond end of file)"
 
-    result_lines = []
-    for i, line in enumerate(selected, start=start + 1):
-        result_lines.append(f"{i:6d}\t{line}")
+    body = None
+    if len(selected) > NUMBA_MIN_LINES:
+        body = format_numbered_lines(selected, start + 1)
+    if body is None:
+        body = "\n".join([f"{i:6d}\t{line}" for i, line in enumerate(selected, start=start + 1)])
 
-    total = len(lines)
     header = f"File: {path} ({total} lines total)"
     if start > 0 or end < total:
         header += f" [showing lines {start+1}-{min(end, total)}]"
 
-    return header + "\n" + "\n".join(result_lines)
+    return f"{header}\n{body}"
+
+
+def _write_bytes_direct(path: Path, data: bytes) -> None:
+    """
+    Write data with unbuffered os.write calls, then advise the kernel to drop
+    the file from the page cache, since generated files are rarely reread.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view[:WRITE_CHUNK_BYTES])
+            view = view[written:]
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
 
 
 def write_file(path: str, content: str, *, working_dir: Path) -> str:
@@ -53,36 +141,63 @@ def write_file(path: str, content: str, *, working_dir: Path) -> str:
     file_path = _resolve(path, working_dir)
     try:
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(content, encoding="utf-8")
+        if len(content) > DIRECT_WRITE_MIN_CHARS:
+            _write_bytes_direct(file_path, content.encode("utf-8"))
+        else:
+            file_path.write_text(content, encoding="utf-8")
         lines = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
         return f"Successfully wrote {lines} lines to {path}"
     except Exception as e:
         return f"Error writing file: {e}"
 
 
+def _to_crlf(data: bytes) -> bytes:
+    """Convert all line endings in data to CRLF."""
+    return data.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+
+
 def edit_file(path: str, old_string: str, new_string: str, *, working_dir: Path) -> str:
     """Edit a file by replacing old_string with new_string (must be unique)."""
     file_path = _resolve(path, working_dir)
     if not file_path.exists():
         return f"Error: File not found: {path}"
 
+    # Work on the raw bytes: no decode/encode round trip, and line endings and
+    # undecodable bytes outside the edit are written back untouched
     try:
-        content = file_path.read_text(encoding="utf-8", errors="replace")
+        content = file_path.read_bytes()
     except Exception as e:
         return f"Error reading file: {e}"
 
-    count = content.count(old_string)
-    if count == 0:
+    old = old_string.encode("utf-8", errors="surrogatepass")
+    crlf = False
+    idx = content.find(old)
+    if idx == -1 and b"\n" in old and b"\r\n" in content:
+        # Strings from the model use bare newlines; match a CRLF file's line endings
+        old = _to_crlf(old)
+        crlf = True
+        idx = content.find(old)
+
+    # A second find resumed after the match (non-overlapping, like count) rules out
+    # duplicates; only the error message needs the full count
+    if idx == -1:
         return f"Error: String not found in {path}"
-    if count > 1:
+    end = idx + len(old)
+    if content.find(old, max(end, 1)) != -1:
+        # Count characters, not bytes, so an empty old_string reports as before
+        count = content.decode("utf-8", errors="replace").count(
+            old.decode("utf-8", errors="surrogatepass")
+        )
         return (
             f"Error: String found {count} times in {path}. "
             "Provide more context to make it unique."
         )
 
-    new_content = content.replace(old_string, new_string, 1)
     try:
-        file_path.write_text(new_content, encoding="utf-8")
+        new = new_string.encode("utf-8")
+        if crlf:
+            new = _to_crlf(new)
+        file_path.write_bytes(content[:idx] + new + content[end:])
         return f"Successfully edited {path}"
     except Exception as e:
         return f"Error writing file: {e}"
@@ -90,6 +205,7 @@ def edit_file(path: str, old_string: str, new_string: str, *, working_dir: Path)
 
 def register_file_tools(working_dir: Path) -> None:
     """Register all file tools into the global registry."""
+
     register_tool(Tool(
         name="read_file",
         description=(
@@ -115,7 +231,7 @@ def register_file_tools(working_dir: Path) -> None:
             },
             "required": ["path"],
         },
-        handler=lambda **kwargs: read_file(**kwargs, working_dir=working_dir),
+        handler=partial(read_file, working_dir=working_dir),
         requires_permission=False,
     ))
 
@@ -136,7 +252,7 @@ def register_file_tools(working_dir: Path) -> None:
             },
             "required": ["path", "content"],
         },
-        handler=lambda **kwargs: write_file(**kwargs, working_dir=working_dir),
+        handler=partial(write_file, working_dir=working_dir),
         requires_permission=True,
     ))
 
@@ -165,6 +281,6 @@ def register_file_tools(working_dir: Path) -> None:
             },
             "required": ["path", "old_string", "new_string"],
         },
-        handler=lambda **kwargs: edit_file(**kwargs, working_dir=working_dir),
+        handler=partial(edit_file, working_dir=working_dir),
         requires_permission=True,
     ))
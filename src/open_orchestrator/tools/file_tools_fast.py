@@ -0,0 +1,71 @@
+"""
+Optional compiled helpers for file tools.
+Requires numba: ``pip install open-orchestrator[jit]``.
+"""
+
+from __future__ import annotations
+
+try:
+    import numba
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+# Width the line number is padded to, as in f"{n:6d}"
+_NUMBER_WIDTH = 6
+
+
+if HAVE_NUMBA:
+    @numba.njit(cache=True)
+    def _format_lines_numba(buf, line_ends, start_line, out):  # type: ignore[no-untyped-def]
+        """Write '{n:6d}\\t{line}' rows joined by newlines into out; return bytes written."""
+        digits = np.empty(20, np.uint8)
+        pos = 0
+        begin = 0
+        n_lines = line_ends.size
+        for k in range(n_lines):
+            n = start_line + k
+            nd = 0
+            while True:
+                digits[nd] = 48 + n % 10
+                n //= 10
+                nd += 1
+                if n == 0:
+                    break
+            for _ in range(_NUMBER_WIDTH - nd):
+                out[pos] = 32
+                pos += 1
+            for d in range(nd - 1, -1, -1):
+                out[pos] = digits[d]
+                pos += 1
+            out[pos] = 9
+            pos += 1
+
+            end = line_ends[k]
+            length = end - begin
+            out[pos:pos + length] = buf[begin:end]
+            pos += length
+            if k + 1 < n_lines:
+                out[pos] = 10
+                pos += 1
+            begin = end + 1
+        return pos
+
+
+def format_numbered_lines(lines: list[str], start_line: int) -> str | None:
+    """
+    Same as "\\n".join(f"{i:6d}\\t{line}" ...) numbered from start_line,
+    computed in one compiled pass. Returns None when numba is unavailable.
+    """
+    if not HAVE_NUMBA or not lines:
+        return None
+
+    blob = "\n".join(lines).encode("utf-8")
+    buf = np.frombuffer(blob, dtype=np.uint8)
+    line_ends = np.append(np.flatnonzero(buf == 10), len(blob))
+    number_width = max(_NUMBER_WIDTH, len(str(start_line + len(lines) - 1)))
+    out = np.empty(len(blob) + len(lines) * (number_width + 1), dtype=np.uint8)
+    written = _format_lines_numba(buf, line_ends, start_line, out)
+    return out[:written].tobytes().decode("utf-8")
@@ -2,12 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 import fnmatch
+import os
 import re
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import AnyStr, BinaryIO, Iterator
 
 from open_orchestrator.tools import Tool, register_tool
 
+_NEWLINE = re.compile("\n")
+
+# Files larger than this are grepped line by line instead of read whole
+STREAM_MIN_BYTES = 8 * 1024 * 1024
+
+# Pattern features that only behave like a per-line search when run per line:
+# \A and \Z mean start/end of line there, and lookarounds would otherwise see
+# the neighbouring lines' newlines instead of the string boundary
+_PER_LINE_TOKENS = ("\\A", "\\Z", "(?=", "(?!", "(?<")
+
 
 def _resolve(path: str, working_dir: Path) -> Path:
     """Resolve a path relative to working_dir. Absolute paths pass through."""
@@ -17,17 +33,101 @@ def _resolve(path: str, working_dir: Path) -> Path:
     return working_dir / p
 
 
+@lru_cache(maxsize=256)
+def _compile(pattern: AnyStr, flags: int = 0) -> re.Pattern[AnyStr]:
+    """Compile a regex, reusing the result across calls."""
+    return re.compile(pattern, flags)
+
+
+def _walk(root: str, file_re: re.Pattern[str] | None = None) -> Iterator[str]:
+    """
+    Yield paths of all files under root (optionally only those whose name
+    matches file_re), using os.scandir so no Path objects or extra stat calls
+    are needed. Symlinked directories are not followed; unreadable
+    directories are skipped.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and (file_re is None or file_re.match(entry.name)):
+                    yield entry.path
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one glob path segment into a regex that never crosses '/'."""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            while j < n and segment[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+                continue
+            chars = segment[i:j].replace("\\", "\\\\")
+            chars = re.sub(r"([&~|\[])", r"\\\1", chars)
+            i = j + 1
+            if chars.startswith("!"):
+                chars = "^" + chars[1:]
+            elif chars.startswith("^"):
+                chars = "\\" + chars
+            out.append(f"[{chars}]")
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+@lru_cache(maxsize=256)
+def _glob_re(pattern: str) -> re.Pattern[str]:
+    """
+    Translate a glob pattern into a regex over '/'-separated relative paths,
+    reusing the result across calls. Like Path.rglob, the pattern may match
+    at any depth, and '**' matches zero or more directories.
+    """
+    segments = [seg for seg in pattern.split("/") if seg]
+    parts = ["(?:.*/)?"]
+    for i, seg in enumerate(segments):
+        last = i == len(segments) - 1
+        if seg == "**":
+            parts.append(".*" if last else "(?:.*/)?")
+        else:
+            parts.append(_translate_segment(seg) if last else _translate_segment(seg) + "/")
+    return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+
 def glob(pattern: str, path: str = ".", *, working_dir: Path) -> str:
     """Find files matching a glob pattern."""
     base_path = _resolve(path, working_dir).resolve()
     if not base_path.exists():
         return f"Error: Path does not exist: {path}"
 
+    base = str(base_path)
+    # Length of base plus its trailing separator ("/" has none to add)
+    prefix_len = len(os.path.join(base, ""))
     try:
+        rx = _glob_re(pattern)
         matches = sorted(
-            str(p.relative_to(base_path))
-            for p in base_path.rglob(pattern.lstrip("/"))
-            if p.is_file()
+            rel
+            for rel in (p[prefix_len:].replace(os.sep, "/") for p in _walk(base))
+            if rx.match(rel)
         )
     except Exception as e:
         return f"Error during glob: {e}"
@@ -38,7 +138,167 @@ def glob(pattern: str, path: str = ".", *, working_dir: Path) -> str:
     return "\n".join(matches)
 
 
-def grep(
+def _candidate_lines(
+    text: str,
+    line_starts: list[int],
+    compiled: re.Pattern[str],
+) -> Iterator[int]:
+    """
+    Yield 0-based indexes of lines that may match, using one regex pass over
+    the whole buffer instead of a search per line. After a hit the search
+    resumes at the next line, so every line is considered at most once.
+    """
+    if any(token in compiled.pattern for token in _PER_LINE_TOKENS):
+        yield from range(len(line_starts))
+        return
+
+    rx = _compile(compiled.pattern, compiled.flags | re.MULTILINE)
+    n_lines = len(line_starts)
+    pos = 0
+    while True:
+        m = rx.search(text, pos)
+        if m is None:
+            return
+        idx = bisect_right(line_starts, m.start()) - 1
+        if idx >= n_lines:
+            return
+        yield idx
+        if idx + 1 >= n_lines:
+            return
+        pos = line_starts[idx + 1]
+
+
+def _bytes_pattern(compiled: re.Pattern[str]) -> re.Pattern[bytes] | None:
+    """
+    Compile a bytes twin of an ASCII pattern, or None if there isn't one.
+    On pure-ASCII input the twin matches exactly where the str pattern does.
+    """
+    if not compiled.pattern.isascii():
+        return None
+    try:
+        return _compile(compiled.pattern.encode(), compiled.flags & ~re.UNICODE)
+    except re.error:
+        return None
+
+
+def _iter_lines(f: BinaryIO) -> Iterator[bytes]:
+    """Yield lines without terminators, splitting on LF, CRLF and CR as text mode does."""
+    for raw in f:
+        if raw.endswith(b"\n"):
+            raw = raw[:-2] if raw.endswith(b"\r\n") else raw[:-1]
+        elif raw.endswith(b"\r"):
+            raw = raw[:-1]
+        if b"\r" in raw:
+            yield from raw.split(b"\r")
+        else:
+            yield raw
+
+
+def _scan_stream(
+    file_path: str,
+    compiled: re.Pattern[str],
+    context: int,
+    display_path: str,
+) -> str | None:
+    """
+    Like _scan_file, but reads the file line by line so memory stays bounded
+    by the context window rather than the file size. ASCII lines are tested
+    with a bytes pattern and only decoded when they are printed.
+    """
+    bytes_re = _bytes_pattern(compiled)
+
+    def decode(raw: bytes) -> str:
+        return raw.decode("utf-8", "replace")
+
+    def is_match(raw: bytes) -> bool:
+        if bytes_re is not None and raw.isascii():
+            return bytes_re.search(raw) is not None
+        return compiled.search(decode(raw)) is not None
+
+    before: deque[tuple[int, bytes]] = deque(maxlen=context)
+    blocks: list[list[str]] = []
+    # Blocks still collecting trailing context: [lines, lines still to add]
+    pending: list[list] = []
+
+    with open(file_path, "rb") as f:
+        for line_num, raw in enumerate(_iter_lines(f), 1):
+            if pending:
+                text = decode(raw)
+                for entry in pending:
+                    entry[0].append(f"    {line_num}: {text}")
+                    entry[1] -= 1
+                pending = [entry for entry in pending if entry[1] > 0]
+
+            if is_match(raw):
+                block = [f"    {n}: {decode(b)}" for n, b in before]
+                block.append(f"  > {line_num}: {decode(raw)}")
+                blocks.append(block)
+                if context > 0:
+                    pending.append([block, context])
+
+            if context > 0:
+                before.append((line_num, raw))
+
+    if not blocks:
+        return None
+    matching_lines = []
+    for block in blocks:
+        matching_lines.extend(block)
+        if context > 0:
+            matching_lines.append("  --")
+    return f"{display_path}:\n" + "\n".join(matching_lines)
+
+
+def _scan_file(
+    file_path: str,
+    compiled: re.Pattern[str],
+    context: int,
+    display_path: str,
+) -> str | None:
+    """Search one file. Returns its formatted matches, or None if nothing matched."""
+    if os.path.getsize(file_path) > STREAM_MIN_BYTES:
+        return _scan_stream(file_path, compiled, context, display_path)
+
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    if not text:
+        return None
+
+    # Offset at which each line starts; a trailing newline does not start a new line
+    line_starts = [0]
+    line_starts.extend(m.end() for m in _NEWLINE.finditer(text))
+    if line_starts[-1] == len(text):
+        line_starts.pop()
+    n_lines = len(line_starts)
+
+    def line_at(idx: int) -> str:
+        if idx + 1 < n_lines:
+            return text[line_starts[idx]:line_starts[idx + 1] - 1]
+        return text[line_starts[idx]:].rstrip("\n")
+
+    matching_lines = []
+    for idx in _candidate_lines(text, line_starts, compiled):
+        # Confirm against the line alone so results match a per-line search
+        if not compiled.search(line_at(idx)):
+            continue
+        i = idx + 1
+        start = max(0, idx - context)
+        end = min(n_lines, i + context)
+
+        for j in range(start, end):
+            line_num = j + 1
+            prefix = ">" if line_num == i else " "
+            matching_lines.append(f"  {prefix} {line_num}: {line_at(j)}")
+
+        if context > 0:
+            matching_lines.append("  --")
+
+    if not matching_lines:
+        return None
+    return f"{display_path}:\n" + "\n".join(matching_lines)
+
+
+async def grep(
     pattern: str,
     path: str = ".",
     file_pattern: str | None = None,
@@ -47,56 +307,54 @@ def grep(
     *,
     working_dir: Path,
 ) -> str:
-    """Search for a pattern in files."""
+    """Search for a pattern in files, in one worker thread so the event loop stays free."""
+    # A single thread for the whole walk and scan: re holds the GIL, so
+    # per-file threads would only add dispatch overhead
+    return await asyncio.to_thread(
+        _grep, pattern, path, file_pattern, case_sensitive, context, working_dir
+    )
+
+
+def _grep(
+    pattern: str,
+    path: str,
+    file_pattern: str | None,
+    case_sensitive: bool,
+    context: int,
+    working_dir: Path,
+) -> str:
+    """Blocking implementation of grep."""
     base_path = _resolve(path, working_dir).resolve()
     if not base_path.exists():
         return f"Error: Path does not exist: {path}"
 
     flags = 0 if case_sensitive else re.IGNORECASE
     try:
-        compiled = re.compile(pattern, flags)
+        compiled = _compile(pattern, flags)
     except re.error as e:
         return f"Error: Invalid regex pattern: {e}"
 
-    results = []
-    error_files = []
-
+    # (path to read, path to display) pairs, ordered by path components
     if base_path.is_file():
-        files_to_search = [base_path]
+        files_to_search = [(str(base_path), str(base_path))]
     else:
-        files_to_search = [p for p in base_path.rglob("*") if p.is_file()]
-        if file_pattern:
-            files_to_search = [
-                p for p in files_to_search
-                if fnmatch.fnmatch(p.name, file_pattern)
-            ]
+        file_re = _compile(fnmatch.translate(file_pattern)) if file_pattern else None
+        prefix_len = len(os.path.join(str(base_path), ""))
+        files_to_search = sorted(
+            ((p, p[prefix_len:]) for p in _walk(str(base_path), file_re)),
+            key=lambda item: item[1].split(os.sep),
+        )
 
-    for file_path in sorted(files_to_search):
+    results = []
+    error_count = 0
+    for file_path, display_path in files_to_search:
         try:
-            text = file_path.read_text(encoding="utf-8", errors="replace")
+            part = _scan_file(file_path, compiled, context, display_path)
         except Exception:
-            error_files.append(str(file_path))
+            error_count += 1
             continue
-
-        lines = text.splitlines()
-        matching_lines = []
-
-        for i, line in enumerate(lines, start=1):
-            if compiled.search(line):
-                start = max(0, i - 1 - context)
-                end = min(len(lines), i + context)
-
-                for j in range(start, end):
-                    line_num = j + 1
-                    prefix = ">" if line_num == i else " "
-                    matching_lines.append(f"  {prefix} {line_num}: {lines[j]}")
-
-                if context > 0 and matching_lines:
-                    matching_lines.append("  --")
-
-        if matching_lines:
-            rel_path = file_path.relative_to(base_path) if base_path.is_dir() else file_path
-            results.append(f"{rel_path}:\n" + "\n".join(matching_lines))
+        if part is not None:
+            results.append(part)
 
     if not results:
         msg = f"No matches for '{pattern}'"
@@ -105,8 +363,8 @@ def grep(
         return msg
 
     output = "\n\n".join(results)
-    if error_files:
-        output += f"\n\n[Could not read {len(error_files)} file(s)]"
+    if error_count:
+        output += f"\n\n[Could not read {error_count} file(s)]"
     return output
 
 
@@ -134,7 +392,7 @@ def register_search_tools(working_dir: Path) -> None:
             },
             "required": ["pattern"],
         },
-        handler=lambda **kwargs: glob(**kwargs, working_dir=working_dir),
+        handler=partial(glob, working_dir=working_dir),
         requires_permission=False,
     ))
 
@@ -173,6 +431,6 @@ def register_search_tools(working_dir: Path) -> None:
             },
             "required": ["pattern"],
         },
-        handler=lambda **kwargs: grep(**kwargs, working_dir=working_dir),
+        handler=partial(grep, working_dir=working_dir),
         requires_permission=False,
     ))
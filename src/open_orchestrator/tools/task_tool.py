@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 from typing import TYPE_CHECKING
 
 from open_orchestrator.tools import Tool, register_tool
 
 if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
     from open_orchestrator.config import Config
     from open_orchestrator.permissions import PermissionManager
     from open_orchestrator.tools import ToolRegistry
@@ -15,7 +19,10 @@ SUBAGENT_SYSTEM_PROMPT = """You are a focused sub-agent assistant. Complete the
 assigned to you using the available tools. Be concise and return a clear result.
 Do not ask clarifying questions - make reasonable assumptions and proceed."""
 
-# Tools available to sub-agents by default (excludes 'task' to prevent recursion)
+# Tools that launch sub-agents; never available to a sub-agent itself
+TASK_TOOL_NAMES = frozenset({"task", "task_batch"})
+
+# Tools available to sub-agents by default (excludes the task tools to prevent recursion)
 DEFAULT_SUBAGENT_TOOLS = [
     "read_file",
     "write_file",
@@ -30,8 +37,9 @@ def make_task_handler(
     config: "Config",
     registry: "ToolRegistry",
     permissions: "PermissionManager",
+    client: "AsyncOpenAI | None" = None,
 ) -> object:
-    """Create a task handler bound to config/registry/permissions."""
+    """Create a task handler bound to config/registry/permissions/client."""
 
     async def task(
         prompt: str,
@@ -45,7 +53,9 @@ def make_task_handler(
         from open_orchestrator.agent import Agent
         from open_orchestrator import display
 
-        allowed = tools or DEFAULT_SUBAGENT_TOOLS
+        # Never hand sub-agents the task tools: besides recursion, a sub-agent
+        # holding a task_batch permit and starting another batch would deadlock
+        allowed = [t for t in tools or DEFAULT_SUBAGENT_TOOLS if t not in TASK_TOOL_NAMES]
         sub_system = system_prompt or SUBAGENT_SYSTEM_PROMPT
 
         display.print_info(f"[Sub-agent] Starting task: {prompt[:80]}...")
@@ -57,6 +67,7 @@ def make_task_handler(
             system_prompt=sub_system,
             allowed_tools=allowed,
             is_subagent=True,
+            client=client,
         )
 
         result = await sub_agent.run(prompt)
@@ -66,13 +77,48 @@ def make_task_handler(
     return task
 
 
+def make_task_batch_handler(config: "Config", task: object) -> object:
+    """Create a task_batch handler running `task` for many prompts at once."""
+    # Shared by every batch so concurrent batches stay within the limit too
+    semaphore = asyncio.Semaphore(config.agent.max_parallel_subagents)
+
+    async def task_batch(
+        prompts: list[str],
+        tools: list[str] | None = None,
+        system_prompt: str | None = None,
+    ) -> str:
+        """
+        Launch one sub-agent per prompt, running up to max_parallel_subagents
+        at a time. Returns a JSON list of {"prompt", "result"} in prompt order.
+        """
+        async def run_one(prompt: str) -> str:
+            async with semaphore:
+                return await task(prompt, tools, system_prompt)  # type: ignore[operator]
+
+        results = await asyncio.gather(*(run_one(p) for p in prompts), return_exceptions=True)
+        return json.dumps(
+            [
+                {
+                    "prompt": prompt,
+                    "result": f"Error: {result}" if isinstance(result, Exception) else result,
+                }
+                for prompt, result in zip(prompts, results)
+            ],
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    return task_batch
+
+
 def register_task_tool(
     config: "Config",
     registry: "ToolRegistry",
     permissions: "PermissionManager",
+    client: "AsyncOpenAI | None" = None,
 ) -> None:
-    """Register the task tool into the global registry."""
-    handler = make_task_handler(config, registry, permissions)
+    """Register the task and task_batch tools into the global registry."""
+    handler = make_task_handler(config, registry, permissions, client)
 
     register_tool(Tool(
         name="task",
@@ -107,3 +153,37 @@ def register_task_tool(
         handler=handler,
         requires_permission=False,
     ))
+
+    register_tool(Tool(
+        name="task_batch",
+        description=(
+            "Launch several sub-agents at once, one per prompt, and wait for all of them. "
+            "Use this to investigate independent sub-problems in parallel. "
+            "Returns a JSON list of {prompt, result} in the order given."
+        ),
+        parameters_schema={
+            "type": "object",
+            "properties": {
+                "prompts": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "One task or question per sub-agent",
+                },
+                "tools": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "List of tool names every sub-agent can use. "
+                        f"Defaults to: {DEFAULT_SUBAGENT_TOOLS}"
+                    ),
+                },
+                "system_prompt": {
+                    "type": "string",
+                    "description": "Custom system prompt for the sub-agents (optional)",
+                },
+            },
+            "required": ["prompts"],
+        },
+        handler=make_task_batch_handler(config, handler),
+        requires_permission=False,
+    ))
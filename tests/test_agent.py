@@ -0,0 +1,321 @@
+"""Tests for the agent loop."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from open_orchestrator.agent import PRUNE_LOW_WATER, Agent, _estimate_tokens, _truncate_for_history
+from open_orchestrator.config import Config
+from open_orchestrator.permissions import PermissionManager
+from open_orchestrator.tools import Tool, ToolRegistry
+
+
+def make_chunk(
+    content: str | None = None,
+    tool_calls: list[Any] | None = None,
+    finish_reason: str | None = None,
+) -> SimpleNamespace:
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+
+def make_tc_delta(
+    index: int,
+    id: str | None = None,
+    name: str | None = None,
+    arguments: str | None = None,
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        index=index,
+        id=id,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+class FakeStream:
+    """Async iterator over pre-built chunks, standing in for an SDK stream."""
+
+    def __init__(self, chunks: list[SimpleNamespace]) -> None:
+        self._chunks = iter(chunks)
+
+    def __aiter__(self) -> "FakeStream":
+        return self
+
+    async def __anext__(self) -> SimpleNamespace:
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def make_agent(
+    responses: list[list[SimpleNamespace]],
+    registry: ToolRegistry | None = None,
+) -> Agent:
+    agent = Agent(
+        config=Config(),
+        registry=registry or ToolRegistry(),
+        permissions=PermissionManager(default_mode="auto"),
+        is_subagent=True,
+    )
+    agent._client = MagicMock()
+    agent._client.chat.completions.create = AsyncMock(
+        side_effect=[FakeStream(chunks) for chunks in responses]
+    )
+    return agent
+
+
+def make_echo_registry() -> ToolRegistry:
+    registry = ToolRegistry()
+    registry.register(Tool(
+        name="echo",
+        description="Echo the text back",
+        parameters_schema={"type": "object", "properties": {"text": {"type": "string"}}},
+        handler=lambda text: f"echo: {text}",
+    ))
+    return registry
+
+
+class TestAgentRun:
+    @pytest.mark.asyncio
+    async def test_text_response_is_streamed(self) -> None:
+        agent = make_agent([[
+            make_chunk("Hello, "),
+            make_chunk("world"),
+            make_chunk(finish_reason="stop"),
+        ]])
+        result = await agent.run("hi")
+        assert result == "Hello, world"
+        assert agent.messages[-1] == {"role": "assistant", "content": "Hello, world"}
+        create = agent._client.chat.completions.create
+        assert create.await_count == 1
+        assert create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_tool_call_fragments_are_merged(self) -> None:
+        agent = make_agent(
+            [
+                [
+                    make_chunk(tool_calls=[make_tc_delta(0, id="call_1", name="echo")]),
+                    make_chunk(tool_calls=[make_tc_delta(0, arguments='{"text": ')]),
+                    make_chunk(tool_calls=[make_tc_delta(0, arguments='"ping"}')]),
+                    make_chunk(finish_reason="tool_calls"),
+                ],
+                [make_chunk("done"), make_chunk(finish_reason="stop")],
+            ],
+            registry=make_echo_registry(),
+        )
+        result = await agent.run("call echo")
+        assert result == "done"
+
+        assistant_msg = agent.messages[1]
+        assert assistant_msg["tool_calls"] == [{
+            "id": "call_1",
+            "type": "function",
+            "function": {"name": "echo", "arguments": '{"text": "ping"}'},
+        }]
+        assert agent.messages[2] == {
+            "role": "tool",
+            "tool_call_id": "call_1",
+            "content": "echo: ping",
+        }
+
+    @pytest.mark.asyncio
+    async def test_parallel_tool_results_keep_call_order(self) -> None:
+        agent = make_agent(
+            [
+                [
+                    make_chunk(tool_calls=[
+                        make_tc_delta(0, id="call_a", name="echo", arguments='{"text": "a"}'),
+                        make_tc_delta(1, id="call_b", name="echo", arguments='{"text": "b"}'),
+                    ]),
+                    make_chunk(finish_reason="tool_calls"),
+                ],
+                [make_chunk("done"), make_chunk(finish_reason="stop")],
+            ],
+            registry=make_echo_registry(),
+        )
+        await agent.run("call echo twice")
+        tool_msgs = [m for m in agent.messages if m["role"] == "tool"]
+        assert [(m["tool_call_id"], m["content"]) for m in tool_msgs] == [
+            ("call_a", "echo: a"),
+            ("call_b", "echo: b"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_parallel_tool_error_is_raised_unwrapped(self) -> None:
+        finished = []
+
+        async def slow(text: str) -> str:
+            await asyncio.sleep(0.05)
+            finished.append(text)
+            return text
+
+        registry = make_echo_registry()
+        registry.register(Tool(
+            name="slow",
+            description="Return the text after a delay",
+            parameters_schema={"type": "object", "properties": {"text": {"type": "string"}}},
+            handler=slow,
+        ))
+        agent = make_agent([], registry=registry)
+        real_check = agent.permissions.check
+
+        async def check(call: Any, tool: Any) -> bool:
+            if call.name == "echo":
+                raise RuntimeError("boom")
+            return await real_check(call, tool)
+
+        agent.permissions.check = check  # type: ignore[method-assign]
+        tool_calls = [
+            {"id": "call_a", "function": {"name": "slow", "arguments": '{"text": "a"}'}},
+            {"id": "call_b", "function": {"name": "echo", "arguments": '{"text": "b"}'}},
+        ]
+        with pytest.raises(RuntimeError, match="boom"):
+            await agent._execute_tool_calls(tool_calls)
+        # The sibling call ran to completion instead of being cancelled
+        assert finished == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_no_tools_uses_single_request(self) -> None:
+        agent = make_agent([[make_chunk("only answer"), make_chunk(finish_reason="stop")]])
+        result = await agent.run("hi")
+        assert result == "only answer"
+        create = agent._client.chat.completions.create
+        assert create.await_count == 1
+        assert "tools" not in create.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_run_streaming_shares_the_loop(self) -> None:
+        agent = make_agent([[make_chunk("streamed"), make_chunk(finish_reason="stop")]])
+        result = await agent.run_streaming("hi")
+        assert result == "streamed"
+        assert agent._client.chat.completions.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reset_keeps_system_prompt(self) -> None:
+        agent = make_agent([[make_chunk("ok"), make_chunk(finish_reason="stop")]])
+        await agent.run("hi")
+        assert len(agent.messages) == 2
+        agent.reset()
+        assert agent.messages == []
+        assert agent._wire_messages == [{"role": "system", "content": agent.system_prompt}]
+
+    @pytest.mark.asyncio
+    async def test_reload_config_picks_up_changes(self) -> None:
+        agent = make_agent([[make_chunk("ok"), make_chunk(finish_reason="stop")]])
+        agent.config.llm.model = "other-model"
+        agent.reload_config()
+        await agent.run("hi")
+        assert agent._client.chat.completions.create.call_args.kwargs["model"] == "other-model"
+
+    @pytest.mark.asyncio
+    async def test_api_error_is_reported(self) -> None:
+        agent = make_agent([])
+        agent._client.chat.completions.create = AsyncMock(side_effect=RuntimeError("boom"))
+        result = await agent.run("hi")
+        assert "LLM API error" in result
+
+
+class TestPromptCache:
+    def test_apply_cache_control_tags_prefix(self) -> None:
+        msgs = [
+            {"role": "system", "content": "sys"},
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "reply"},
+            {"role": "user", "content": "second"},
+        ]
+        tagged = Agent._apply_cache_control(msgs)
+        assert tagged[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert tagged[2]["content"][0]["text"] == "reply"
+        assert tagged[2]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert tagged[3] is msgs[3]
+        # Originals are not mutated
+        assert msgs[0]["content"] == "sys"
+        assert msgs[2]["content"] == "reply"
+
+    @pytest.mark.asyncio
+    async def test_prompt_cache_disabled_by_default(self) -> None:
+        agent = make_agent([[make_chunk("ok"), make_chunk(finish_reason="stop")]])
+        await agent.run("hi")
+        sent = agent._client.chat.completions.create.call_args.kwargs["messages"]
+        assert sent[0] == {"role": "system", "content": agent.system_prompt}
+
+
+class TestHistoryPruning:
+    def make_history(self, agent: Agent, rounds: int) -> None:
+        agent._wire_messages.append({"role": "user", "content": "start"})
+        for i in range(rounds):
+            agent._wire_messages.append({
+                "role": "assistant",
+                "tool_calls": [{
+                    "id": f"call_{i}",
+                    "type": "function",
+                    "function": {"name": "echo", "arguments": '{"text": "' + "x" * 400 + '"}'},
+                }],
+            })
+            agent._wire_messages.append({
+                "role": "tool",
+                "tool_call_id": f"call_{i}",
+                "content": "y" * 4000,
+            })
+
+    def test_prune_collapses_oldest_results(self) -> None:
+        agent = make_agent([])
+        agent.config.agent.history_token_budget = 3000
+        agent.config.agent.keep_recent_turns = 2
+        self.make_history(agent, rounds=5)
+
+        agent._prune()
+
+        tool_msgs = [m for m in agent.messages if m["role"] == "tool"]
+        assert tool_msgs[0]["content"] == "[pruned]"
+        assert tool_msgs[0]["tool_call_id"] == "call_0"
+        # The most recent turns are untouched
+        assert tool_msgs[-1]["content"] == "y" * 4000
+        assert tool_msgs[-2]["content"] == "y" * 4000
+        assert agent._wire_messages[0]["role"] == "system"
+
+    def test_prune_goes_below_budget_so_next_prune_is_noop(self) -> None:
+        agent = make_agent([])
+        agent.config.agent.history_token_budget = 6000
+        agent.config.agent.keep_recent_turns = 2
+        self.make_history(agent, rounds=8)
+
+        agent._prune()
+        after_first = list(agent._wire_messages)
+        total = sum(_estimate_tokens(m) for m in after_first)
+        assert total <= 6000 * PRUNE_LOW_WATER
+
+        # The next turn must not rewrite the already-pruned prefix
+        agent._wire_messages.append({"role": "user", "content": "z" * 4800})
+        agent._prune()
+        assert agent._wire_messages[: len(after_first)] == after_first
+
+    def test_prune_noop_under_budget(self) -> None:
+        agent = make_agent([])
+        self.make_history(agent, rounds=2)
+        before = list(agent._wire_messages)
+        agent._prune()
+        assert agent._wire_messages == before
+
+
+class TestTruncateForHistory:
+    def test_short_result_unchanged(self) -> None:
+        assert _truncate_for_history("short", 100) == "short"
+
+    def test_long_result_keeps_head_and_tail(self) -> None:
+        result = "a" * 50 + "b" * 100 + "c" * 50
+        truncated = _truncate_for_history(result, 100)
+        assert truncated.startswith("a" * 50)
+        assert truncated.endswith("c" * 50)
+        assert "[100 chars elided]" in truncated
+
+    def test_zero_limit_disables(self) -> None:
+        result = "x" * 10000
+        assert _truncate_for_history(result, 0) is result
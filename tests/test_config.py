@@ -46,3 +46,22 @@ class TestLoadConfig:
         # Defaults preserved
         assert config.llm.base_url == "http://localhost:8000/v1"
         assert config.permissions.default_mode == "ask"
+
+    def test_reload_after_file_change(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.dump({"llm": {"model": "first"}}))
+        assert load_config(config_file).llm.model == "first"
+
+        config_file.write_text(yaml.dump({"llm": {"model": "second"}}))
+        os.utime(config_file, ns=(0, config_file.stat().st_mtime_ns + 1_000_000))
+        assert load_config(config_file).llm.model == "second"
+
+    def test_cached_config_is_not_shared(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.dump({"permissions": {"auto_allow": ["glob"]}}))
+        first = load_config(config_file)
+        first.llm.model = "mutated"
+        first.permissions.auto_allow.append("bash")
+        second = load_config(config_file)
+        assert second.llm.model != "mutated"
+        assert second.permissions.auto_allow == ["glob"]
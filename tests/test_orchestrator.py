@@ -0,0 +1,53 @@
+"""Tests for the multi-agent orchestrator."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from open_orchestrator.config import Config
+from open_orchestrator.orchestrator import Orchestrator
+from open_orchestrator.permissions import PermissionManager
+from open_orchestrator.tools import ToolRegistry
+
+
+def make_orchestrator(config: Config | None = None) -> Orchestrator:
+    return Orchestrator(
+        config=config or Config(),
+        registry=ToolRegistry(),
+        permissions=PermissionManager(default_mode="auto"),
+    )
+
+
+class TestOrchestrator:
+    def test_agents_share_client(self) -> None:
+        orchestrator = make_orchestrator()
+        main_agent = orchestrator.create_main_agent()
+        sub_agent = orchestrator.create_subagent()
+        assert main_agent._client is orchestrator.client
+        assert sub_agent._client is orchestrator.client
+
+    @pytest.mark.asyncio
+    async def test_run_parallel_respects_concurrency_limit(self) -> None:
+        config = Config()
+        config.agent.max_parallel_subagents = 2
+        orchestrator = make_orchestrator(config)
+
+        running = 0
+        peak = 0
+
+        async def fake_run(self: object, prompt: str) -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return f"done: {prompt}"
+
+        with patch("open_orchestrator.agent.Agent.run", new=fake_run):
+            results = await orchestrator.run_parallel([f"p{i}" for i in range(5)])
+
+        assert results == [f"done: p{i}" for i in range(5)]
+        assert peak == 2
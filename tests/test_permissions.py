@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -121,6 +122,23 @@ class TestPermissionManager:
             assert result is False
             assert pm.quit_requested is True
 
+    @pytest.mark.asyncio
+    async def test_ask_mode_quit_denies_waiting_calls(self) -> None:
+        prompt = AsyncMock(return_value="q")
+        with (
+            patch("open_orchestrator.display.print_permission_request"),
+            patch("open_orchestrator.display.print_info"),
+            patch("open_orchestrator.permissions._async_input", new=prompt),
+        ):
+            pm = PermissionManager(default_mode="ask")
+            tool = make_tool("bash", requires_permission=True)
+            results = await asyncio.gather(
+                pm.check(make_call("bash"), tool),
+                pm.check(make_call("bash"), tool),
+            )
+            assert results == [False, False]
+            prompt.assert_awaited_once()
+
     def test_set_mode(self) -> None:
         pm = PermissionManager(default_mode="ask")
         pm.set_mode("auto")
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import sys
+from functools import partial
+
 import pytest
 
 from open_orchestrator.tools import Tool, ToolCall, ToolRegistry
@@ -38,6 +41,20 @@ class TestToolRegistry:
         registry.register(tool)
         assert registry.get("my_tool") is tool
 
+    def test_freeze_keeps_lookups_and_blocks_registration(self) -> None:
+        registry = ToolRegistry()
+        tool = make_test_tool("tool_a")
+        registry.register(tool)
+        registry.freeze()
+        assert registry.get("".join(["tool", "_a"])) is tool
+        with pytest.raises(RuntimeError, match="frozen"):
+            registry.register(make_test_tool("tool_b"))
+        assert registry.names() == ["tool_a"]
+
+    def test_tool_call_name_is_interned(self) -> None:
+        call = ToolCall(id="1", name="".join(["tool", "_a"]), arguments={})
+        assert call.name is sys.intern("tool_a")
+
     def test_get_unknown_returns_none(self) -> None:
         registry = ToolRegistry()
         assert registry.get("unknown") is None
@@ -64,6 +81,16 @@ class TestToolRegistry:
         assert len(schema) == 1
         assert schema[0]["function"]["name"] == "tool_a"
 
+    def test_to_openai_schema_reregister_replaces_entry(self) -> None:
+        registry = ToolRegistry()
+        registry.register(make_test_tool("tool_a"))
+        replacement = make_test_tool("tool_a")
+        replacement.description = "Replaced"
+        registry.register(replacement)
+        schema = registry.to_openai_schema()
+        assert len(schema) == 1
+        assert schema[0]["function"]["description"] == "Replaced"
+
     @pytest.mark.asyncio
     async def test_execute_sync_handler(self) -> None:
         registry = ToolRegistry()
@@ -80,6 +107,25 @@ class TestToolRegistry:
         result = await registry.execute(call)
         assert "async result" in result
 
+    def test_is_async_detected_at_construction(self) -> None:
+        assert make_test_tool(async_fn=True).is_async
+        assert not make_test_tool(async_fn=False).is_async
+        tool = make_test_tool()
+        tool_partial = Tool(tool.name, tool.description, {}, partial(async_handler, value="x"))
+        assert tool_partial.is_async
+
+    @pytest.mark.asyncio
+    async def test_execute_awaits_coroutine_from_sync_callable(self) -> None:
+        registry = ToolRegistry()
+        registry.register(Tool(
+            name="wrapped",
+            description="Lambda around an async handler",
+            parameters_schema={"type": "object", "properties": {}},
+            handler=lambda **kwargs: async_handler(**kwargs),
+        ))
+        result = await registry.execute(ToolCall(id="5", name="wrapped", arguments={}))
+        assert "async result" in result
+
     @pytest.mark.asyncio
     async def test_execute_unknown_tool(self) -> None:
         registry = ToolRegistry()
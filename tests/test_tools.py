@@ -3,13 +3,21 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import threading
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from open_orchestrator.tools.bash_tool import bash
-from open_orchestrator.tools.file_tools import edit_file, read_file, write_file
-from open_orchestrator.tools.search_tools import glob, grep
+from open_orchestrator.config import Config
+from open_orchestrator.tools import ToolCall, ToolRegistry
+from open_orchestrator.tools import bash_tool
+from open_orchestrator.tools.bash_tool import bash, register_bash_tool
+from open_orchestrator.tools.file_tools import edit_file, read_file, register_file_tools, write_file
+from open_orchestrator.tools.search_tools import _glob_re, glob, grep, register_search_tools
+from open_orchestrator.permissions import PermissionManager
+from open_orchestrator.tools.task_tool import make_task_batch_handler, make_task_handler
 
 
 class TestReadFile:
@@ -34,6 +42,75 @@ class TestReadFile:
         assert "line1" not in result
         assert "line4" not in result
 
+    def test_read_line_count_and_numbering(self, tmp_path: Path) -> None:
+        f = tmp_path / "test.txt"
+        f.write_text("a\r\nb\r\n\nc")
+        result = read_file(str(f), working_dir=tmp_path)
+        assert result.splitlines() == [
+            f"File: {f} (4 lines total)",
+            "     1\ta",
+            "     2\tb",
+            "     3\t",
+            "     4\tc",
+        ]
+
+    def test_only_newline_breaks_lines(self, tmp_path: Path) -> None:
+        # Form feeds and other splitlines() separators stay inside the line
+        f = tmp_path / "test.txt"
+        f.write_text("a\x0cb\nc\u2028d\n")
+        result = read_file(str(f), working_dir=tmp_path)
+        assert result.split("\n") == [
+            f"File: {f} (2 lines total)",
+            "     1\ta\x0cb",
+            "     2\tc\u2028d",
+        ]
+
+    def test_mmap_window_matches_full_read(self, tmp_path: Path) -> None:
+        f = tmp_path / "big.txt"
+        f.write_text("".join(f"line {i} é\n" for i in range(1, 501)))
+        windows = [(1, 10), (250, 3), (499, 10), (600, 5)]
+        expected = [read_file(str(f), o, n, working_dir=tmp_path) for o, n in windows]
+        with (
+            patch("open_orchestrator.tools.file_tools.MMAP_MIN_BYTES", 0),
+            patch("open_orchestrator.tools.file_tools.COUNT_CHUNK_BYTES", 64),
+        ):
+            actual = [read_file(str(f), o, n, working_dir=tmp_path) for o, n in windows]
+        assert actual == expected
+        assert "   250\tline 250 é" in actual[1]
+
+    def test_mmap_window_falls_back_for_carriage_returns(self, tmp_path: Path) -> None:
+        f = tmp_path / "crlf.txt"
+        f.write_bytes(b"one\r\ntwo\rthree\n")
+        with patch("open_orchestrator.tools.file_tools.MMAP_MIN_BYTES", 0):
+            result = read_file(str(f), 2, 1, working_dir=tmp_path)
+        assert "(3 lines total)" in result
+        assert "     2\ttwo" in result
+
+    def test_long_window_numbering(self, tmp_path: Path) -> None:
+        # Compares the compiled formatter against the Python one
+        pytest.importorskip("numba")
+        f = tmp_path / "long.txt"
+        f.write_text("".join(f"row {i}\tvalue é\n" for i in range(1, 21)))
+        expected = read_file(str(f), 3, 15, working_dir=tmp_path)
+        with patch("open_orchestrator.tools.file_tools.NUMBA_MIN_LINES", 0):
+            assert read_file(str(f), 3, 15, working_dir=tmp_path) == expected
+        assert "    17\trow 17\tvalue é" in expected
+
+    def test_numba_formatter_matches_python(self) -> None:
+        pytest.importorskip("numba")
+        from open_orchestrator.tools.file_tools_fast import format_numbered_lines
+
+        lines = ["first", "", "tab\there", "日本語", "last"]
+        for start_line in (1, 999_998):
+            expected = "\n".join(f"{i:6d}\t{line}" for i, line in enumerate(lines, start_line))
+            assert format_numbered_lines(lines, start_line) == expected
+
+    def test_read_empty_file(self, tmp_path: Path) -> None:
+        f = tmp_path / "empty.txt"
+        f.write_text("")
+        result = read_file(str(f), working_dir=tmp_path)
+        assert "empty" in result
+
     def test_read_directory_returns_error(self, tmp_path: Path) -> None:
         result = read_file(str(tmp_path), working_dir=tmp_path)
         assert "Error" in result
@@ -45,6 +122,40 @@ class TestReadFile:
         assert "content" in result
 
 
+class TestFileToolHandlers:
+    @pytest.mark.asyncio
+    async def test_registered_handlers_run_off_the_event_loop(self, tmp_path: Path) -> None:
+        f = tmp_path / "test.txt"
+        f.write_text("hello\n")
+        registry = ToolRegistry()
+        with patch("open_orchestrator.tools.file_tools.register_tool", registry.register):
+            register_file_tools(tmp_path)
+
+        loop_thread = threading.get_ident()
+        read_tool = registry.get("read_file")
+        handler = read_tool.handler
+        seen_threads = []
+
+        def recording_handler(**kwargs: object) -> str:
+            seen_threads.append(threading.get_ident())
+            return handler(**kwargs)
+
+        read_tool.handler = recording_handler
+        result = await registry.execute(
+            ToolCall(id="1", name="read_file", arguments={"path": "test.txt"})
+        )
+        assert "hello" in result
+        assert seen_threads and seen_threads[0] != loop_thread
+
+        result = await registry.execute(ToolCall(
+            id="2",
+            name="edit_file",
+            arguments={"path": "test.txt", "old_string": "hello", "new_string": "bye"},
+        ))
+        assert "Successfully" in result
+        assert f.read_text() == "bye\n"
+
+
 class TestWriteFile:
     def test_write_new_file(self, tmp_path: Path) -> None:
         path = str(tmp_path / "new_file.txt")
@@ -70,6 +181,18 @@ class TestWriteFile:
         assert "Successfully" in result
         assert (tmp_path / "rel.txt").read_text() == "data\n"
 
+    def test_write_large_file_direct(self, tmp_path: Path) -> None:
+        f = tmp_path / "big.txt"
+        f.write_text("previous content that is longer than the new one\n" * 10)
+        content = "résumé line\n" * 50
+        with (
+            patch("open_orchestrator.tools.file_tools.DIRECT_WRITE_MIN_CHARS", 0),
+            patch("open_orchestrator.tools.file_tools.WRITE_CHUNK_BYTES", 7),
+        ):
+            result = write_file(str(f), content, working_dir=tmp_path)
+        assert result == f"Successfully wrote 50 lines to {f}"
+        assert f.read_text(encoding="utf-8") == content
+
 
 class TestEditFile:
     def test_edit_unique_string(self, tmp_path: Path) -> None:
@@ -97,6 +220,27 @@ class TestEditFile:
         assert "Error" in result
         assert "2" in result  # found 2 times
 
+    def test_edit_preserves_crlf_and_other_bytes(self, tmp_path: Path) -> None:
+        f = tmp_path / "file.txt"
+        f.write_bytes(b"first\r\n\xff raw\r\nsecond line\r\n")
+        result = edit_file(str(f), "second", "2nd", working_dir=tmp_path)
+        assert "Successfully" in result
+        assert f.read_bytes() == b"first\r\n\xff raw\r\n2nd line\r\n"
+
+    def test_edit_multiline_in_crlf_file(self, tmp_path: Path) -> None:
+        f = tmp_path / "file.txt"
+        f.write_bytes(b"a = 1\r\nb = 2\r\nc = 3\r\n")
+        result = edit_file(str(f), "a = 1\nb = 2", "a = 1\nb = 20\nb2 = 0", working_dir=tmp_path)
+        assert "Successfully" in result
+        assert f.read_bytes() == b"a = 1\r\nb = 20\r\nb2 = 0\r\nc = 3\r\n"
+
+    def test_edit_overlapping_occurrences_count_once(self, tmp_path: Path) -> None:
+        f = tmp_path / "file.txt"
+        f.write_text("x = aaa\n")
+        result = edit_file(str(f), "aa", "b", working_dir=tmp_path)
+        assert "Successfully" in result
+        assert f.read_text() == "x = ba\n"
+
 
 class TestBashTool:
     @pytest.mark.asyncio
@@ -114,11 +258,83 @@ class TestBashTool:
         result = await bash("sleep 10", timeout=1, working_dir=tmp_path)
         assert "timed out" in result.lower()
 
+    @pytest.mark.asyncio
+    async def test_zero_timeout_does_not_leak_pipes(self, tmp_path: Path) -> None:
+        fd_dir = Path("/proc/self/fd")
+        if not fd_dir.is_dir():
+            pytest.skip("needs /proc")
+        before = len(list(fd_dir.iterdir()))
+        for _ in range(5):
+            result = await bash("sleep 1; true", timeout=0, working_dir=tmp_path)
+            assert "timed out" in result
+        # Killed children are reaped in the background; let that finish first
+        await asyncio.gather(*bash_tool._pending_waits)
+        assert len(list(fd_dir.iterdir())) == before
+
     @pytest.mark.asyncio
     async def test_stderr_captured(self, tmp_path: Path) -> None:
         result = await bash("echo error >&2", working_dir=tmp_path)
         assert "error" in result
 
+    @pytest.mark.asyncio
+    async def test_missing_cwd_is_an_error(self, tmp_path: Path) -> None:
+        result = await bash("pwd", cwd=str(tmp_path / "missing"), working_dir=tmp_path)
+        assert result.startswith("Error executing command")
+
+    @pytest.mark.asyncio
+    async def test_asyncio_fallback_matches_spawn_path(self, tmp_path: Path) -> None:
+        command = "echo out; echo err >&2; exit 3"
+        spawned = await bash(command, working_dir=tmp_path)
+        with patch("open_orchestrator.tools.bash_tool._USE_POSIX_SPAWN", False):
+            fallback = await bash(command, working_dir=tmp_path)
+        assert spawned == fallback == "Exit code 3:\nout\n[stderr]\nerr"
+
+    @pytest.mark.asyncio
+    async def test_simple_command_skips_the_shell(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "listed.txt").touch()
+        monkeypatch.chdir(tmp_path)
+        with (
+            patch("open_orchestrator.tools.bash_tool._run_spawned") as spawned,
+            patch("open_orchestrator.tools.bash_tool._run_asyncio") as shell,
+        ):
+            result = await bash("ls -a", working_dir=tmp_path)
+        assert "listed.txt" in result
+        spawned.assert_not_called()
+        shell.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("same_cwd", [True, False])
+    async def test_timeout_with_grandchild_holding_pipes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, same_cwd: bool
+    ) -> None:
+        (tmp_path / "spawn.sh").write_text("sleep 8 &\nsleep 8\n")
+        if same_cwd:
+            monkeypatch.chdir(tmp_path)  # lets "sh spawn.sh" take the exec fast path
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await bash("sh spawn.sh", timeout=1, working_dir=tmp_path)
+        assert "timed out" in result
+        assert loop.time() - started < 4
+
+    @pytest.mark.asyncio
+    async def test_unknown_simple_command_reported_by_shell(self, tmp_path: Path) -> None:
+        result = await bash("no-such-command-xyz --flag", working_dir=tmp_path)
+        assert result.startswith("Exit code 127")
+        assert "not found" in result
+
+    @pytest.mark.asyncio
+    async def test_registered_handler_runs_command(self, tmp_path: Path) -> None:
+        registry = ToolRegistry()
+        with patch("open_orchestrator.tools.bash_tool.register_tool", registry.register):
+            register_bash_tool(tmp_path)
+        assert registry.get("bash").is_async
+        result = await registry.execute(
+            ToolCall(id="1", name="bash", arguments={"command": "echo registered"})
+        )
+        assert "registered" in result
+
     @pytest.mark.asyncio
     async def test_cwd(self, tmp_path: Path) -> None:
         result = await bash("pwd", cwd=str(tmp_path), working_dir=tmp_path)
@@ -160,42 +376,172 @@ class TestGlob:
         result = glob("*.py", working_dir=tmp_path)
         assert "found.py" in result
 
+    def test_directory_prefix_pattern(self, tmp_path: Path) -> None:
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "src" / "top.py").touch()
+        (tmp_path / "src" / "pkg" / "inner.py").touch()
+        (tmp_path / "other.py").touch()
+        assert glob("src/*.py", working_dir=tmp_path) == "src/top.py"
+        assert glob("src/**/*.py", working_dir=tmp_path).split("\n") == [
+            "src/pkg/inner.py",
+            "src/top.py",
+        ]
+
+    def test_pattern_translation_is_cached(self) -> None:
+        assert _glob_re("src/**/*.py") is _glob_re("src/**/*.py")
+        assert _glob_re("*.py").match("pkg/mod.py")
+        assert not _glob_re("src/*.py").match("src/pkg/mod.py")
+
+    def test_skips_directories(self, tmp_path: Path) -> None:
+        (tmp_path / "dir.py").mkdir()
+        (tmp_path / "file.py").touch()
+        assert glob("*.py", working_dir=tmp_path) == "file.py"
+
+    def test_filesystem_root(self, tmp_path: Path) -> None:
+        with patch("open_orchestrator.tools.search_tools._walk", return_value=["/etc/hosts"]):
+            assert glob("etc/hosts", "/", working_dir=tmp_path) == "etc/hosts"
+
 
 class TestGrep:
-    def test_find_pattern(self, tmp_path: Path) -> None:
+    @pytest.mark.asyncio
+    async def test_find_pattern(self, tmp_path: Path) -> None:
         f = tmp_path / "file.txt"
         f.write_text("hello world\nfoo bar\nbaz qux\n")
-        result = grep("hello", str(f), working_dir=tmp_path)
+        result = await grep("hello", str(f), working_dir=tmp_path)
         assert "hello" in result
         assert "foo bar" not in result
 
-    def test_no_matches(self, tmp_path: Path) -> None:
+    @pytest.mark.asyncio
+    async def test_no_matches(self, tmp_path: Path) -> None:
         f = tmp_path / "file.txt"
         f.write_text("hello world\n")
-        result = grep("xyz", str(f), working_dir=tmp_path)
+        result = await grep("xyz", str(f), working_dir=tmp_path)
         assert "No matches" in result
 
-    def test_case_insensitive(self, tmp_path: Path) -> None:
+    @pytest.mark.asyncio
+    async def test_case_insensitive(self, tmp_path: Path) -> None:
         f = tmp_path / "file.txt"
         f.write_text("Hello World\n")
-        result = grep("hello", str(f), case_sensitive=False, working_dir=tmp_path)
+        result = await grep("hello", str(f), case_sensitive=False, working_dir=tmp_path)
         assert "Hello" in result
 
-    def test_file_pattern_filter(self, tmp_path: Path) -> None:
+    @pytest.mark.asyncio
+    async def test_file_pattern_filter(self, tmp_path: Path) -> None:
         (tmp_path / "a.py").write_text("import foo\n")
         (tmp_path / "b.txt").write_text("import bar\n")
-        result = grep("import", str(tmp_path), file_pattern="*.py", working_dir=tmp_path)
+        result = await grep("import", str(tmp_path), file_pattern="*.py", working_dir=tmp_path)
         assert "a.py" in result
         assert "b.txt" not in result
 
-    def test_context_lines(self, tmp_path: Path) -> None:
+    @pytest.mark.asyncio
+    async def test_context_lines(self, tmp_path: Path) -> None:
         f = tmp_path / "file.txt"
         f.write_text("before\nmatch here\nafter\n")
-        result = grep("match", str(f), context=1, working_dir=tmp_path)
+        result = await grep("match", str(f), context=1, working_dir=tmp_path)
         assert "before" in result
         assert "after" in result
 
-    def test_default_path_uses_working_dir(self, tmp_path: Path) -> None:
+    @pytest.mark.asyncio
+    async def test_default_path_uses_working_dir(self, tmp_path: Path) -> None:
         (tmp_path / "target.txt").write_text("findme\n")
-        result = grep("findme", working_dir=tmp_path)
+        result = await grep("findme", working_dir=tmp_path)
         assert "findme" in result
+
+    @pytest.mark.asyncio
+    async def test_results_sorted_across_files(self, tmp_path: Path) -> None:
+        for name in ("c.txt", "a.txt", "b.txt"):
+            (tmp_path / name).write_text(f"needle in {name}\n")
+        result = await grep("needle", str(tmp_path), working_dir=tmp_path)
+        assert result.index("a.txt:") < result.index("b.txt:") < result.index("c.txt:")
+
+    @pytest.mark.asyncio
+    async def test_streamed_large_file_matches_buffered(self, tmp_path: Path) -> None:
+        f = tmp_path / "log.txt"
+        f.write_bytes(b"start\r\nerror one\nok\rerror caf\xc3\xa9\nok\nerror end")
+        buffered = await grep("error", str(tmp_path), context=1, working_dir=tmp_path)
+        with patch("open_orchestrator.tools.search_tools.STREAM_MIN_BYTES", 0):
+            streamed = await grep("error", str(tmp_path), context=1, working_dir=tmp_path)
+        assert streamed == buffered
+        assert "> 4: error café" in streamed
+
+    @pytest.mark.asyncio
+    async def test_filesystem_root_display_paths(self, tmp_path: Path) -> None:
+        f = tmp_path / "file.txt"
+        f.write_text("needle\n")
+        with patch("open_orchestrator.tools.search_tools._walk", return_value=[str(f)]):
+            result = await grep("needle", "/", working_dir=tmp_path)
+        assert result.startswith(f"{str(f)[1:]}:\n")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("pattern", "content", "expected"),
+        [
+            (r"(?<!\s)foo", "x\nfoo\n", "> 2: foo"),
+            (r"(?<![\n])foo", "x\nfoo\n", "> 2: foo"),
+            (r"\Afoo", "x\nfoo\n", "> 2: foo"),
+            (r"foo(?!\s)", "x foo\n", "> 1: x foo"),
+            (r"foo(?![\n])", "x foo\n", "> 1: x foo"),
+        ],
+    )
+    async def test_lookarounds_at_line_edges_match_like_per_line(
+        self, tmp_path: Path, pattern: str, content: str, expected: str
+    ) -> None:
+        f = tmp_path / "file.txt"
+        f.write_text(content)
+        result = await grep(pattern, str(f), working_dir=tmp_path)
+        assert expected in result
+
+    @pytest.mark.asyncio
+    async def test_registered_handler_awaits_grep(self, tmp_path: Path) -> None:
+        (tmp_path / "target.txt").write_text("findme\n")
+        registry = ToolRegistry()
+        with patch("open_orchestrator.tools.search_tools.register_tool", registry.register):
+            register_search_tools(tmp_path)
+        result = await registry.execute(
+            ToolCall(id="1", name="grep", arguments={"pattern": "findme"})
+        )
+        assert "target.txt" in result
+
+
+class TestTaskBatch:
+    @pytest.mark.asyncio
+    async def test_runs_prompts_within_limit_in_order(self) -> None:
+        config = Config()
+        config.agent.max_parallel_subagents = 2
+        running = 0
+        peak = 0
+
+        async def fake_task(prompt: str, tools: object, system_prompt: object) -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if prompt == "bad":
+                raise ValueError("boom")
+            return f"done: {prompt}"
+
+        task_batch = make_task_batch_handler(config, fake_task)
+        result = json.loads(await task_batch(["a", "bad", "c", "d"]))
+
+        assert peak == 2
+        assert result == [
+            {"prompt": "a", "result": "done: a"},
+            {"prompt": "bad", "result": "Error: boom"},
+            {"prompt": "c", "result": "done: c"},
+            {"prompt": "d", "result": "done: d"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sub_agents_never_get_task_tools(self) -> None:
+        seen_allowed = []
+
+        async def fake_run(self: object, prompt: str) -> str:
+            seen_allowed.append(self.allowed_tools)  # type: ignore[attr-defined]
+            return "ok"
+
+        task = make_task_handler(Config(), ToolRegistry(), PermissionManager(default_mode="auto"))
+        with patch("open_orchestrator.agent.Agent.run", new=fake_run):
+            await task("p", tools=["read_file", "task", "task_batch"])
+        assert seen_allowed == [["read_file"]]
+